@@ -1,2 +1,3 @@
 # from simple_search import Search, Frontier, Node
-# from adversarial_search import MiniMax
\ No newline at end of file
+# from adversarial_search import MiniMax
+# from mcts import MCTS
@@ -1,5 +1,88 @@
 import ast
+import math
+import multiprocessing
 import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+try:
+    from .hashing import make_hashable
+    from .stats import SearchStats
+except ImportError:  # Imported as a top-level module, see algos/__init__.py
+    from hashing import make_hashable
+    from stats import SearchStats
+
+# Bound types of a transposition table entry
+EXACT, LOWER, UPPER = 0, 1, 2
+
+TTEntry = namedtuple("TTEntry", ["value", "depth", "flag", "move"])
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget of a move runs out."""
+
+
+# Engine of a worker process of the parallel search, set by _init_worker
+_worker_engine = None
+
+def _init_worker(engine, shared_bound=None):
+    global _worker_engine
+    _worker_engine = engine
+    engine.shared_bound = shared_bound
+
+def _search_subtree(state, action, index, alpha, beta, k, maximizing, deadline):
+    """
+    Runs in a worker process: searches the position reached by taking the action of
+    the given index in state, returning its value and whether the search was cut off
+    by its depth limit.
+    """
+    engine = _worker_engine
+    engine.deadline = deadline
+    engine.horizon_reached = False
+    engine.task_index, engine.root_maximizing = index, maximizing
+    search = engine.min if maximizing else engine.max
+    value = engine._search_action(search, state, action, alpha, beta, k, False)
+    return value, engine.horizon_reached
+
+
+class TranspositionTable:
+    """
+    A bounded cache of searched positions, keyed on hashable state keys.
+    Each entry stores the value found, the remaining search depth it was found at,
+    its bound type (EXACT, LOWER or UPPER bound) and the best move.
+    Replacement policy: an entry is only replaced by a search at least as deep,
+    and the least recently stored entry is evicted when the table is full.
+    """
+    def __init__(self, max_size=1_000_000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, key, depth):
+        """Returns the entry stored for key if it was searched at least as deep, else None."""
+        entry = self.entries.get(key)
+        if entry is None or entry.depth < depth:
+            return None
+        return entry
+
+    def best_move(self, key):
+        """Returns the best move stored for key at any depth, for move ordering."""
+        entry = self.entries.get(key)
+        return entry.move if entry else None
+
+    def store(self, key, value, depth, flag, move):
+        entry = self.entries.get(key)
+        if entry is not None and entry.depth > depth:
+            return  # Depth-preferred, keep the deeper search
+        self.entries[key] = TTEntry(value, depth, flag, move)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"TranspositionTable(size={len(self)}/{self.max_size})"
+
 
 class MiniMax:
     """
@@ -19,6 +102,24 @@ class MiniMax:
                  heuristic_fn: callable = None,
                  pretty_print_fn = print,
                  play_as = -1,
+                 tt_size = None,
+                 hash_fn: callable = None,
+                 pvs = False,
+                 aspiration_window = None,
+                 time_limit = None,
+                 order_actions_fn: callable = None,
+                 tt_move_ordering = True,
+                 killer_moves = False,
+                 history_heuristic = False,
+                 apply_action_fn: callable = None,
+                 undo_action_fn: callable = None,
+                 batch_heuristic_fn: callable = None,
+                 n_workers = None,
+                 canonicalize_fn: callable = None,
+                 transform_action_fn: callable = None,
+                 opening_book = None,
+                 outcome_fn: callable = None,
+                 stats = False,
         ):
         """
         Parameters:
@@ -44,6 +145,69 @@ class MiniMax:
         - pretty_print_fn (callable): Optional function for printing state 
         during the game. Default is normal print. 
         - plays_as: 1 for MAX player, -1 for MIN. 
+        - tt_size (int): Maximum number of positions kept in the transposition table,
+        which caches search results of positions reached through different move orders.
+        Default is None (no transposition table).
+        - hash_fn (callable): Optional function that takes in a state and returns a hashable
+        key for the transposition table. Defaults to a generic conversion of the state
+        into nested tuples.
+        - pvs (bool): Whether to use principal variation search, i.e. search all moves
+        but the first with a null window, and only search them again with the full
+        window when they turn out better. Default is False.
+        - aspiration_window (float): Optional half-width of the window the AI's move search
+        starts with, centered on the value of its previous move. The search is repeated
+        with a full window when the value falls outside of it. Default is None (full window).
+        - time_limit (float): Optional time budget in seconds for each AI move. The AI then
+        uses iterative deepening, searching 1, 2, ... plies deep (up to max_depth) and
+        playing the best action of the last search completed in time. Needs heuristic_fn
+        (or batch_heuristic_fn). Default is None.
+        - order_actions_fn (callable): Optional function that takes in a state and a list
+        of its actions, and returns them ordered from most to least promising.
+        Alpha-beta pruning cuts off more of the tree when good moves are searched first.
+        - tt_move_ordering (bool): Whether to search first the best move stored in the
+        transposition table for a position. Default is True.
+        - killer_moves (bool): Whether to search early the last two moves that caused a
+        cutoff at the same ply (killer moves). Default is False.
+        - history_heuristic (bool): Whether to order moves by how often and how deep
+        they caused cutoffs so far (history heuristic). Default is False.
+        - apply_action_fn (callable): Optional function that takes in a state and an action,
+        and applies the action to the state in place, returning any information needed to
+        undo it. Lets the search work on a single board instead of copying it at every node.
+        - undo_action_fn (callable): Function that takes in a state, the action last applied
+        to it and the information returned by apply_action_fn, and undoes the action in
+        place. Needed with apply_action_fn.
+        - batch_heuristic_fn (callable): Optional function that takes in a state and a list
+        of its actions, and returns the heuristic values of the states they lead to, all at
+        once (e.g. vectorized). Used one ply above the depth limit, instead of searching
+        the children one by one.
+        - n_workers (int): Optional number of worker processes searching the AI's moves
+        in parallel. The first move is searched on its own to get a bound, then the other
+        moves are spread across the workers. All the game functions must be picklable
+        (e.g. module-level functions). Default is None (serial search).
+        - canonicalize_fn (callable): Optional function that takes in a state and returns
+        a key shared by all the positions equivalent to it under the game's symmetries
+        (used instead of hash_fn), along with the symmetry mapping the state onto the
+        orientation the key stands for. Equivalent positions then share their
+        transposition table entries.
+        - transform_action_fn (callable): Function that takes in an action, a symmetry
+        returned by canonicalize_fn and an `inverse` flag, and returns the image of
+        the action under the symmetry (or under its inverse). Needed with canonicalize_fn,
+        to store moves in the canonical orientation and map them back.
+        - opening_book (OpeningBook): Optional book of positions searched offline
+        (see algos/opening_book.py), keyed like the transposition table. The AI plays
+        the book move of a position right away when the book searched it at least
+        as deep as requested. Needs a hash_fn (or canonicalize_fn) returning integer
+        keys, e.g. zobrist_key. Default is None.
+        - outcome_fn (callable): Optional function that takes in a state and the action
+        that led to it (None for the position the search starts from), and returns the
+        utility of the state if the game is over, else None. Used instead of terminal_fn
+        and utility_fn during the search, so games can only check the lines touching
+        the last move instead of scanning the whole board twice.
+        - stats (bool): Whether to record statistics of each best_action call (nodes per
+        depth, branching factor, cutoffs, cache hits, calls and time of each game
+        function), available as a SearchStats in `self.stats` after the call. When off
+        (the default), `self.stats` is None and the search runs at full speed. Work done
+        by the worker processes of the parallel search isn't recorded.
         """
         self.empty_state = empty_state
         self.player_turn_fn = player_turn_fn
@@ -56,41 +220,463 @@ class MiniMax:
         self.play_as = play_as
         self.pretty_print_fn = pretty_print_fn
         self.states_history = []
-        
+        self.tt = TranspositionTable(tt_size) if tt_size else None
+        self.hash_fn = hash_fn or make_hashable
+        self.pvs = pvs
+        self.aspiration_window = aspiration_window
+        self.prev_value = None  # Value of the AI's previous move
+        # Iterative deepening always stops at a depth limit, where positions need a heuristic
+        assert time_limit is None or heuristic_fn or batch_heuristic_fn, \
+        "Please provide a heuristic_fn when using a time_limit."
+        self.time_limit = time_limit
+        self.deadline = None
+        self.horizon_reached = False  # Whether the last search was cut off by its depth limit
+        self.completed_depth = None  # Depth of the last search completed by iterative deepening
+        self.order_actions_fn = order_actions_fn
+        self.tt_move_ordering = tt_move_ordering
+        self.killer_moves = killer_moves
+        self.history_heuristic = history_heuristic
+        self.ply = 0  # Distance from the root of the current search
+        self.killers = {}  # Maps plies to their last two cutoff moves
+        self.history = {}  # Maps (is MAX player, action) pairs to their cutoff scores
+        assert (apply_action_fn is None) == (undo_action_fn is None), \
+        "Please provide both apply_action_fn and undo_action_fn, or neither."
+        self.apply_action_fn = apply_action_fn
+        self.undo_action_fn = undo_action_fn
+        self.batch_heuristic_fn = batch_heuristic_fn
+        self.n_workers = n_workers
+        self.executor = None  # Process pool of the parallel search, started on first use
+        # Best value found at the root of the parallel search and the index of its action,
+        # shared with the workers so they can narrow the windows of the moves they search
+        self.shared_bound = None
+        self.task_index = None  # Index of the root action searched, in a worker
+        self.root_maximizing = None
+        assert (canonicalize_fn is None) == (transform_action_fn is None), \
+        "Please provide both canonicalize_fn and transform_action_fn, or neither."
+        self.canonicalize_fn = canonicalize_fn
+        self.transform_action_fn = transform_action_fn
+        self.opening_book = opening_book
+        if opening_book is not None and not isinstance(self._tt_key(empty_state)[0], int):
+            raise ValueError("Opening books are keyed on integers, please provide a hash_fn "
+                             "(or canonicalize_fn) returning integer keys, e.g. zobrist_key.")
+        self.outcome_fn = outcome_fn
+        self.stats = SearchStats() if stats else None
+        if self.stats is not None:
+            for name in ("player_turn_fn", "list_actions_fn", "take_action_fn", "terminal_fn",
+                         "utility_fn", "heuristic_fn", "hash_fn", "order_actions_fn",
+                         "apply_action_fn", "undo_action_fn", "batch_heuristic_fn",
+                         "canonicalize_fn", "transform_action_fn", "outcome_fn"):
+                setattr(self, name, self.stats.timed(name, getattr(self, name)))
 
     
-    def min(self, state, alpha=float("-inf"), k=None):
+    def min(self, state, alpha=float("-inf"), beta=float("inf"), k=None, first_action=None,
+            last_action=None):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _SearchTimeout
+        if self.stats is not None:
+            self.stats.nodes[self.ply] += 1
         if k == 0:
+            self.horizon_reached = True
             return self.heuristic_fn(state), None
-        if self.terminal_fn(state):
+        if self.outcome_fn is not None:
+            utility = self.outcome_fn(state, last_action)
+            if utility is not None:
+                return utility, None
+        elif self.terminal_fn(state):
             return self.utility_fn(state), None
+        key = symmetry = None
+        if self.tt is not None:
+            (key, symmetry), depth = self._tt_key(state), (float("inf") if k is None else k)
+            entry = self._probe(key, depth, alpha, beta)
+            if entry:
+                return entry.value, self._map_action(entry.move, symmetry, inverse=True)
+        if k == 1 and self.batch_heuristic_fn is not None:
+            return self._evaluate_horizon(state, key, symmetry, maximizing=False)
         minn, action_minn = float("inf"), None
-        for action in self.list_actions_fn(state):
-            result_state = self.take_action_fn(state, action)
-            optimal_play, _ = self.max(result_state, minn, k=(None if k is None else k-1))
+        i = -1
+        for i, (action, source) in enumerate(self._ordered_actions(state, first_action, key, False, symmetry)):
+            if self.task_index is not None and self.ply == 1:
+                alpha, beta = self._shared_window(alpha, beta)
+                if minn <= alpha:
+                    break
+            if self.stats is not None:
+                self.stats.moves_searched[source] += 1
+            optimal_play = self._search_action(self.max, state, action, alpha, min(beta, minn), k, i > 0)
             if optimal_play < minn:
                 minn = optimal_play
                 action_minn = action
             if minn <= alpha:
+                self._record_cutoff(action, source, k, False, i)
                 break
+        if self.stats is not None:
+            self.stats.expand(self.ply, i + 1)
+        if self.tt is not None:
+            self._store(key, depth, minn, alpha, beta, action_minn, symmetry)
         return minn, action_minn
 
 
-    def max(self, state, beta=float("inf"), k=None):
+    def max(self, state, alpha=float("-inf"), beta=float("inf"), k=None, first_action=None,
+            last_action=None):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _SearchTimeout
+        if self.stats is not None:
+            self.stats.nodes[self.ply] += 1
         if k == 0:
+            self.horizon_reached = True
             return self.heuristic_fn(state), None
-        if self.terminal_fn(state):
+        if self.outcome_fn is not None:
+            utility = self.outcome_fn(state, last_action)
+            if utility is not None:
+                return utility, None
+        elif self.terminal_fn(state):
             return self.utility_fn(state), None
+        key = symmetry = None
+        if self.tt is not None:
+            (key, symmetry), depth = self._tt_key(state), (float("inf") if k is None else k)
+            entry = self._probe(key, depth, alpha, beta)
+            if entry:
+                return entry.value, self._map_action(entry.move, symmetry, inverse=True)
+        if k == 1 and self.batch_heuristic_fn is not None:
+            return self._evaluate_horizon(state, key, symmetry, maximizing=True)
         maxx, action_maxx = float("-inf"), None
-        for action in self.list_actions_fn(state):
-            result_state = self.take_action_fn(state, action)
-            optimal_play, _ = self.min(result_state, maxx, k=(None if k is None else k-1))
+        i = -1
+        for i, (action, source) in enumerate(self._ordered_actions(state, first_action, key, True, symmetry)):
+            if self.task_index is not None and self.ply == 1:
+                alpha, beta = self._shared_window(alpha, beta)
+                if maxx >= beta:
+                    break
+            if self.stats is not None:
+                self.stats.moves_searched[source] += 1
+            optimal_play = self._search_action(self.min, state, action, max(alpha, maxx), beta, k, i > 0)
             if optimal_play > maxx:
                 maxx = optimal_play
                 action_maxx = action
             if maxx >= beta:
+                self._record_cutoff(action, source, k, True, i)
                 break
+        if self.stats is not None:
+            self.stats.expand(self.ply, i + 1)
+        if self.tt is not None:
+            self._store(key, depth, maxx, alpha, beta, action_maxx, symmetry)
         return maxx, action_maxx
+
+    def _evaluate_horizon(self, state, key, symmetry, maximizing):
+        """
+        Scores all the children of a node one ply above the depth limit with
+        a single batch_heuristic_fn call, returning the best value and action.
+        """
+        self.horizon_reached = True
+        actions = list(self.list_actions_fn(state))
+        values = self.batch_heuristic_fn(state, actions)
+        if self.stats is not None:
+            self.stats.expand(self.ply, len(actions))
+        best_value, best_action = (float("-inf") if maximizing else float("inf")), None
+        for value, action in zip(values, actions):
+            if (value > best_value) if maximizing else (value < best_value):
+                best_value, best_action = value, action
+        if self.tt is not None:
+            self.tt.store(key, best_value, 1, EXACT, self._map_action(best_action, symmetry))
+        return best_value, best_action
+
+    def _ordered_actions(self, state, first_action=None, key=None, maximizing=True, symmetry=None):
+        """
+        Returns the actions available in state along with the source that ordered them:
+        first_action (if given), then the transposition table move, the killer moves,
+        and the other actions ordered by order_actions_fn and the history heuristic.
+        """
+        actions = list(self.list_actions_fn(state))
+        source = "default"
+        if self.order_actions_fn:
+            actions, source = list(self.order_actions_fn(state, actions)), "order"
+        if self.history_heuristic:
+            # Stable sort, so order_actions_fn still breaks ties
+            actions.sort(key=lambda action: self.history.get((maximizing, action), 0), reverse=True)
+            source = "history"
+        front = []
+        if first_action is not None:
+            front.append((first_action, "first"))
+        if self.tt_move_ordering and key is not None:
+            front.append((self._map_action(self.tt.best_move(key), symmetry, inverse=True), "tt"))
+        if self.killer_moves:
+            front.extend((killer, "killer") for killer in self.killers.get(self.ply, ()))
+        if not front:
+            return [(action, source) for action in actions]
+        ordered, seen = [], set()
+        for action, action_source in front:
+            if action is not None and action not in seen and action in actions:
+                ordered.append((action, action_source))
+                seen.add(action)
+        ordered.extend((action, source) for action in actions if action not in seen)
+        return ordered
+
+    def _record_cutoff(self, action, source, k, maximizing, index):
+        """Updates the killer moves, history table and stats after a cutoff."""
+        if self.stats is not None:
+            self.stats.cutoff(self.ply, index, source)
+        if self.killer_moves:
+            killers = self.killers.setdefault(self.ply, [])
+            if action not in killers:
+                killers.insert(0, action)
+                del killers[2:]
+        if self.history_heuristic:
+            depth = 1 if k is None else k
+            self.history[(maximizing, action)] = self.history.get((maximizing, action), 0) + depth * depth
+
+    def _search_action(self, search, state, action, alpha, beta, k, null_window):
+        """
+        Searches the position reached by taking action in state, either on a copy
+        of the state (take_action_fn) or in place (apply_action_fn / undo_action_fn).
+        """
+        if self.apply_action_fn is None:
+            return self._search_child(search, self.take_action_fn(state, action), action,
+                                      alpha, beta, k, null_window)
+        undo_info = self.apply_action_fn(state, action)
+        try:
+            return self._search_child(search, state, action, alpha, beta, k, null_window)
+        finally:
+            self.undo_action_fn(state, action, undo_info)
+
+    def _search_child(self, search, state, action, alpha, beta, k, null_window):
+        """
+        Searches a child position within the (alpha, beta) window and returns its value.
+        With principal variation search, all children but the first are searched with
+        a null window first, which only tells whether they improve on the best move so far.
+        """
+        k = None if k is None else k - 1
+        self.ply += 1
+        try:
+            return self._search_child_window(search, state, action, alpha, beta, k, null_window)
+        finally:
+            self.ply -= 1
+
+    def _search_child_window(self, search, state, action, alpha, beta, k, null_window):
+        if self.pvs and null_window:
+            if search == self.min:  # Parent is MAX, test if the child beats alpha
+                value, _ = search(state, alpha, math.nextafter(alpha, math.inf), k, last_action=action)
+            else:  # Parent is MIN, test if the child beats beta
+                value, _ = search(state, math.nextafter(beta, -math.inf), beta, k, last_action=action)
+            if not alpha < value < beta:
+                return value
+        value, _ = search(state, alpha, beta, k, last_action=action)
+        return value
+
+    def _probe(self, key, depth, alpha, beta):
+        """Returns the transposition table entry of a position if it settles its value."""
+        entry = self.tt.get(key, depth)
+        if entry and (entry.flag == EXACT
+                      or (entry.flag == LOWER and entry.value >= beta)
+                      or (entry.flag == UPPER and entry.value <= alpha)):
+            if self.stats is not None:
+                self.stats.cache_lookup(True)
+            if math.isfinite(entry.depth):
+                self.horizon_reached = True  # The cached search may have been depth limited
+            return entry
+        if self.stats is not None:
+            self.stats.cache_lookup(False)
+        return None
+
+    def _store(self, key, depth, value, alpha, beta, move, symmetry=None):
+        # Failing low only proves an upper bound on the value, failing high a lower bound
+        flag = UPPER if value <= alpha else LOWER if value >= beta else EXACT
+        self.tt.store(key, value, depth, flag, self._map_action(move, symmetry))
+
+    def _tt_key(self, state):
+        """Returns the transposition table key of a state and its symmetry, if any."""
+        if self.canonicalize_fn is None:
+            return self.hash_fn(state), None
+        return self.canonicalize_fn(state)
+
+    def _map_action(self, action, symmetry, inverse=False):
+        """Maps an action to the canonical orientation of its position, or back with inverse."""
+        if action is None or self.transform_action_fn is None:
+            return action
+        return self.transform_action_fn(action, symmetry, inverse)
+
+    def best_action(self, state, k=None):
+        """
+        Searches the best action for the player to move in state, returning its value
+        and the action. With a time limit, iterative deepening is used.
+        """
+        if self.stats is None:
+            return self._best_action(state, k)
+        self.stats.reset()
+        start = time.perf_counter()
+        try:
+            return self._best_action(state, k)
+        finally:
+            self.stats.elapsed = time.perf_counter() - start
+
+    def _best_action(self, state, k=None):
+        if self.opening_book is not None:
+            result = self._book_move(state, k)
+            if result is not None:
+                self.prev_value = result[0]
+                return result
+        # Killer plies are relative to the root, and old history scores fade out
+        self.killers = {}
+        self.history = {move: score // 2 for move, score in self.history.items() if score > 1}
+        if self.time_limit is None:
+            return self._search_root(state, k)
+        return self._iterative_deepening(state, k)
+
+    def _book_move(self, state, k):
+        """Returns the value and move of state from the opening book, if it was searched deep enough."""
+        key, symmetry = self._tt_key(state)
+        entry = self.opening_book.get(key)
+        if entry is None or (entry.depth is not None and (k is None or entry.depth < k)):
+            return None
+        return entry.value, self._map_action(entry.move, symmetry, inverse=True)
+
+    def _search_root(self, state, k, first_action=None):
+        """
+        Searches state k plies deep. With aspiration windows on, the search starts
+        with a narrow window around the value of the previous search.
+        """
+        search = self.max if self.player_turn_fn(state) == 1 else self.min
+        if self.n_workers is not None and k != 0 and not self.terminal_fn(state):
+            search = self._parallel_search
+        if self.aspiration_window is not None and self.prev_value is not None \
+                and math.isfinite(self.prev_value):
+            alpha = self.prev_value - self.aspiration_window
+            beta = self.prev_value + self.aspiration_window
+            value, action = search(state, alpha, beta, k, first_action)
+            if alpha < value < beta:
+                self.prev_value = value
+                return value, action
+        value, action = search(state, k=k, first_action=first_action)
+        self.prev_value = value
+        return value, action
+
+    def _parallel_search(self, state, alpha=float("-inf"), beta=float("inf"), k=None, first_action=None):
+        """
+        Root-split search across the worker processes (young brothers wait): the first
+        action is searched here to get a bound, then the other ones are handed out in
+        order as workers free up, each one searched with the best value found so far as
+        its bound. That value is also shared with the running workers, which narrow
+        their window with it between two of their moves. Ties go to the earliest action,
+        so the serial search's move is played.
+        """
+        maximizing = self.player_turn_fn(state) == 1
+        search = self.min if maximizing else self.max
+        key = depth = symmetry = None
+        if self.tt is not None:
+            (key, symmetry), depth = self._tt_key(state), (float("inf") if k is None else k)
+        actions = [action for action, _ in
+                   self._ordered_actions(state, first_action, key, maximizing, symmetry)]
+
+        def window():
+            return (max(alpha, best), beta) if maximizing else (alpha, min(beta, best))
+
+        def cutoff():
+            return best >= beta if maximizing else best <= alpha
+
+        def share():
+            with self.shared_bound.get_lock():
+                self.shared_bound[:] = [best, best_index]
+
+        best, best_index = float("-inf") if maximizing else float("inf"), 0
+        best = self._search_action(search, state, actions[0], *window(), k, False)
+        if self.shared_bound is None:
+            self.shared_bound = multiprocessing.Array("d", 2)
+        share()
+        executor = self._get_executor(_init_worker, self.shared_bound)
+        pending, next_index = {}, 1  # Maps futures to the index of their action
+        try:
+            while not cutoff() and (pending or next_index < len(actions)):
+                while next_index < len(actions) and len(pending) < self.n_workers:
+                    future = executor.submit(_search_subtree, state, actions[next_index], next_index,
+                                             *window(), k, maximizing, self.deadline)
+                    pending[future] = next_index
+                    next_index += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=pending.get):
+                    index = pending.pop(future)
+                    value, horizon_reached = future.result()
+                    self.horizon_reached = self.horizon_reached or horizon_reached
+                    if ((value > best) if maximizing else (value < best)) \
+                            or (value == best and index < best_index):
+                        best, best_index = value, index
+                        share()
+        finally:
+            for future in pending:
+                future.cancel()
+        if self.tt is not None:
+            self._store(key, depth, best, alpha, beta, actions[best_index], symmetry)
+        return best, actions[best_index]
+
+    def _get_executor(self, initializer=_init_worker, *initargs):
+        """
+        Returns the process pool, started on first use. Each worker gets its own copy
+        of the engine (see __getstate__), passed to initializer along with initargs.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=initializer,
+                                                initargs=(self, *initargs))
+        return self.executor
+
+    def _shared_window(self, alpha, beta):
+        """
+        In a worker of the parallel search, narrows the window of the root action searched
+        with the best value found at the root so far. Only values of earlier actions are
+        used, since later ones lose ties.
+        """
+        with self.shared_bound.get_lock():
+            best, best_index = self.shared_bound[:]
+        if best_index < self.task_index and alpha < best < beta:
+            return (best, beta) if self.root_maximizing else (alpha, best)
+        return alpha, beta
+
+    def close(self):
+        """Shuts down the worker processes of the parallel search and closes the opening book, if any."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        if self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+    def __getstate__(self):
+        # Copies sent to worker processes start with an empty transposition table
+        state = self.__dict__.copy()
+        state["executor"] = None
+        state["shared_bound"] = None  # Handed to the workers when they start, see _init_worker
+        state["opening_book"] = None  # Only the root is looked up, and mmaps can't be pickled
+        state["states_history"] = []
+        if self.stats is not None:
+            # Workers run the game functions themselves, without recording stats
+            state.update(self.stats.originals)
+            state["stats"] = None
+        if self.tt is not None:
+            state["tt"] = TranspositionTable(self.tt.max_size)
+        return state
+
+    def _iterative_deepening(self, state, k=None):
+        """
+        Searches state 1, 2, ... plies deep (up to k plies) until the time limit runs out,
+        each search trying the best action of the previous one first. Returns the result
+        of the deepest search completed. The first search always runs to completion,
+        so there is an action to play, and deepening stops early once a search
+        reaches no depth-limited position, i.e. it solved the game.
+        """
+        deadline = time.perf_counter() + self.time_limit
+        best, depth = None, 1
+        while k is None or depth <= k:
+            self.deadline = deadline if best else None
+            self.horizon_reached = False
+            start = time.perf_counter()
+            try:
+                result = self._search_root(state, depth, best[1] if best else None)
+            except _SearchTimeout:
+                break
+            finally:
+                self.deadline = None
+                if self.stats is not None:
+                    self.stats.iterations[depth] = time.perf_counter() - start
+            best, self.completed_depth = result, depth
+            if not self.horizon_reached or time.perf_counter() >= deadline:
+                break
+            depth += 1
+        return best
     
     def game(self):
         print("\n\nStarting the adversarial MiniMax game.")
@@ -118,8 +704,7 @@ class MiniMax:
             else:
                 time.sleep(1)
                 print("\nIt's the AI's turn.")
-                _, action = (self.max(current_state, k=self.max_depth) if self.play_as == -1 
-                             else self.min(current_state, k=self.max_depth)) 
+                _, action = self.best_action(current_state, k=self.max_depth)
                 print(f"AI chose action: {action}.")
                 current_state = self.take_action_fn(current_state, action)
             print(f"New state:\n")
@@ -136,3 +721,5 @@ class MiniMax:
             print("Tough luck! The AI won this time! 😈")
         if input("Do you want to play again? YES / NO? ").lower() == "yes":
             self.game()
+        else:
+            self.close()
@@ -0,0 +1,15 @@
+def make_hashable(value):
+    """
+    Recursively converts lists/sets/dicts into immutable types (tuples)
+    so they can be hashed, e.g. to use a state as a dict key.
+    """
+    if isinstance(value, list):
+        return tuple(make_hashable(x) for x in value)
+    elif isinstance(value, tuple):
+        return tuple(make_hashable(x) for x in value)
+    elif isinstance(value, set):
+        return tuple(sorted(make_hashable(x) for x in value))
+    elif isinstance(value, dict):
+        return tuple(sorted((k, make_hashable(v)) for k, v in value.items()))
+    else:
+        return value
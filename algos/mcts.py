@@ -0,0 +1,212 @@
+import math
+import os
+import random
+import time
+try:
+    from .adversarial_search import MiniMax
+except ImportError:  # Imported as a top-level module, see algos/__init__.py
+    from adversarial_search import MiniMax
+
+# Engine of a worker process running playouts, set by _init_worker
+_worker_engine = None
+
+def _init_worker(engine):
+    global _worker_engine
+    _worker_engine = engine
+    # Forked workers would otherwise all play the same random playouts
+    engine.random = random.Random(f"{engine.seed}-{os.getpid()}")
+
+def _run_playouts(state, n_playouts):
+    return _worker_engine.playouts(state, n_playouts)
+
+
+class MCTSNode:
+    """
+    A node of the search tree. Values are summed from the MAX player's point of view,
+    over all the playouts that went through the node.
+    """
+    __slots__ = ("state", "parent", "action", "children", "untried", "player",
+                 "terminal", "utility", "visits", "value_sum")
+
+    def __init__(self, state, parent, action, player, terminal, utility, untried):
+        self.state = state
+        self.parent = parent
+        self.action = action  # Action that led from the parent to this node
+        self.children = {}  # Maps actions to child nodes
+        self.untried = untried  # Actions without a child node yet
+        self.player = player  # Player to move
+        self.terminal = terminal
+        self.utility = utility
+        self.visits = 0
+        self.value_sum = 0
+
+
+class MCTS(MiniMax):
+    """
+    Monte Carlo Tree Search (UCT) for adversarial games. Instead of searching every
+    move a few plies deep, it grows a tree towards the most promising moves and values
+    positions with random playouts until the end of the game, which scales to games
+    with a wide branching factor.
+    It takes in the same game functions as MiniMax and has the same best_action and
+    game methods, so it can replace it for any game. MiniMax-only options are ignored.
+    """
+
+    def __init__(self, *args,
+                 time_limit = None,
+                 n_iterations = None,
+                 exploration = math.sqrt(2),
+                 reuse_tree = True,
+                 n_playouts = 1,
+                 playout_fn: callable = None,
+                 seed = None,
+                 **kwargs):
+        """
+        Parameters:
+        ------------
+        - Same game functions as MiniMax. time_limit is the time budget of each AI move,
+        n_workers the number of worker processes running the playouts in parallel, and
+        stats only records the calls and time of the game functions.
+        - n_iterations (int): Number of tree iterations (selection, expansion, playouts
+        and backpropagation) for each AI move. The search stops at whichever budget
+        runs out first. Defaults to 1,000 iterations when there is no time_limit either.
+        - exploration (float): UCT exploration constant. Higher values try more moves,
+        lower values focus on the best ones so far. Default is sqrt(2).
+        - reuse_tree (bool): Whether to keep the subtree of the position reached after
+        the AI's and the opponent's moves, instead of starting every move from scratch.
+        - n_playouts (int): Number of playouts run from each new node, as one batch.
+        - playout_fn (callable): Optional function that takes in a non-terminal state and
+        a number of playouts, and returns the utilities of that many playouts from the
+        state (e.g. vectorized or heuristic playouts). Defaults to random playouts.
+        - seed: Optional seed of the random playouts.
+        """
+        # Playouts go to the end of the game, no heuristic is needed with a time limit
+        super().__init__(*args, **kwargs)
+        self.time_limit = time_limit
+        if n_iterations is None and self.time_limit is None:
+            n_iterations = 1_000
+        assert n_playouts >= 1, "Please run at least one playout per node."
+        self.n_iterations = n_iterations
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.n_playouts = n_playouts
+        self.playout_fn = playout_fn
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.root = None
+        self.iterations = 0  # Iterations run for the last move
+
+    def _best_action(self, state, k=None):
+        """
+        Searches the best action for the player to move in state, returning its
+        estimated value (mean utility of its playouts) and the action. The action
+        played is the most visited one. k is unused, playouts go to the end of the game.
+        """
+        root = self._find_root(state) if self.reuse_tree else None
+        self.root = root or self._new_node(state)
+        if self.root.terminal:
+            return self.root.utility, None
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self.iterations = 0
+        # At least one iteration, so there is an action to play
+        while self.iterations == 0 or (
+                (self.n_iterations is None or self.iterations < self.n_iterations)
+                and (deadline is None or time.perf_counter() < deadline)):
+            self._iterate()
+            self.iterations += 1
+        child = max(self.root.children.values(), key=lambda child: child.visits)
+        return child.value_sum / child.visits, child.action
+
+    def _iterate(self):
+        node = self.root
+        # Selection: go down the fully expanded nodes with the UCT formula
+        while not node.untried and node.children:
+            node = self._select(node)
+        # Expansion: add one child for an untried action
+        if node.untried:
+            action = node.untried.pop()
+            child = self._new_node(self.take_action_fn(node.state, action), node, action)
+            node.children[action] = child
+            node = child
+        # Simulation
+        if node.terminal:
+            utilities = [node.utility] * self.n_playouts
+        else:
+            utilities = self._batch_playouts(node.state)
+        # Backpropagation
+        n_playouts, total = len(utilities), sum(utilities)
+        while node is not None:
+            node.visits += n_playouts
+            node.value_sum += total
+            node = node.parent
+
+    def _select(self, node):
+        # Children values are seen from the point of view of the player choosing between them
+        log_visits = math.log(node.visits)
+        return max(node.children.values(),
+                   key=lambda child: node.player * child.value_sum / child.visits
+                   + self.exploration * math.sqrt(log_visits / child.visits))
+
+    def _new_node(self, state, parent=None, action=None):
+        utility = self._outcome(state, action)
+        terminal = utility is not None
+        untried = [] if terminal else list(self.list_actions_fn(state))
+        self.random.shuffle(untried)
+        return MCTSNode(state, parent, action, self.player_turn_fn(state), terminal, utility, untried)
+
+    def _outcome(self, state, last_action=None):
+        """Returns the utility of state if the game is over, else None."""
+        if self.outcome_fn is not None:
+            return self.outcome_fn(state, last_action)
+        return self.utility_fn(state) if self.terminal_fn(state) else None
+
+    def _find_root(self, state):
+        """
+        Returns the node of state in the previous tree, looking at the previous root
+        and the positions two moves below it, or None if it isn't there.
+        """
+        if self.root is None:
+            return None
+        key = self.hash_fn(state)
+        candidates = [self.root] + [grandchild for child in self.root.children.values()
+                                    for grandchild in child.children.values()]
+        for node in candidates:
+            if self.hash_fn(node.state) == key:
+                node.parent = None
+                return node
+        return None
+
+    def _batch_playouts(self, state):
+        """Runs the playouts of a new node, split across the worker processes if any."""
+        if self.n_workers is None:
+            return self.playouts(state, self.n_playouts)
+        executor = self._get_executor(_init_worker)
+        sizes = [self.n_playouts // self.n_workers + (i < self.n_playouts % self.n_workers)
+                 for i in range(self.n_workers)]
+        futures = [executor.submit(_run_playouts, state, size) for size in sizes if size]
+        return [utility for future in futures for utility in future.result()]
+
+    def playouts(self, state, n_playouts):
+        """Returns the utilities of n_playouts playouts from state."""
+        if self.playout_fn is not None:
+            return self.playout_fn(state, n_playouts)
+        return [self.random_playout(state) for _ in range(n_playouts)]
+
+    def random_playout(self, state):
+        """Plays random moves from state until the end of the game, returning its utility."""
+        copied = False
+        utility = self._outcome(state)
+        while utility is None:
+            action = self.random.choice(list(self.list_actions_fn(state)))
+            # Moves are made in place once the playout works on its own copy of the state
+            if self.apply_action_fn is None or not copied:
+                state, copied = self.take_action_fn(state, action), True
+            else:
+                self.apply_action_fn(state, action)
+            utility = self._outcome(state, action)
+        return utility
+
+    def __getstate__(self):
+        # Worker processes only run playouts, they don't need the tree
+        state = super().__getstate__()
+        state["root"] = None
+        return state
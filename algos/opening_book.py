@@ -0,0 +1,119 @@
+import ast
+import mmap
+import struct
+from collections import namedtuple
+
+# File layout: header, moves (their reprs, one per line), then fixed-size records
+# sorted by key. Keys are non-negative integers of up to 128 bits (e.g. Zobrist keys).
+HEADER = struct.Struct(">8sQQ")  # Magic, number of records, size of the moves section
+RECORD = struct.Struct(">16sdII")  # Key, value, search depth, index of the best move
+MAGIC = b"MMBOOK01"
+UNLIMITED = 0xFFFFFFFF  # Depth of positions searched without depth limit
+
+BookEntry = namedtuple("BookEntry", ["value", "depth", "move"])
+
+
+class OpeningBook:
+    """
+    A read-only book of searched positions, memory-mapped from a file written by
+    write_book / build_book. Lookups are binary searches straight into the mapped
+    file, so opening a book is instant and its records are never loaded as a whole.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_records, moves_size = HEADER.unpack_from(self.mm, 0)
+        assert magic == MAGIC, f"{path} isn't an opening book file."
+        moves = self.mm[HEADER.size:HEADER.size + moves_size].decode()
+        self.moves = [ast.literal_eval(move) for move in moves.splitlines()]
+        self.records_offset = HEADER.size + moves_size
+
+    def get(self, key):
+        """Returns the BookEntry of the position with the given key, or None."""
+        target = key.to_bytes(16, "big")
+        low, high = 0, self.n_records
+        while low < high:
+            middle = (low + high) // 2
+            offset = self.records_offset + middle * RECORD.size
+            middle_key = self.mm[offset:offset + 16]
+            if middle_key < target:
+                low = middle + 1
+            elif middle_key > target:
+                high = middle
+            else:
+                _, value, depth, move = RECORD.unpack_from(self.mm, offset)
+                return BookEntry(value, None if depth == UNLIMITED else depth, self.moves[move])
+        return None
+
+    def __len__(self):
+        return self.n_records
+
+    def close(self):
+        self.mm.close()
+
+
+def write_book(path, entries):
+    """
+    Writes a book file from a dict mapping position keys to (value, depth, move),
+    where depth is None for positions searched without depth limit. Moves must be
+    Python literals (e.g. ints or tuples), they're stored as their repr.
+    """
+    moves, move_indices = [], {}
+    records = []
+    for key, (value, depth, move) in entries.items():
+        assert 0 <= key < 2 ** 128, "Book keys must be non-negative integers of up to 128 bits."
+        if move not in move_indices:
+            move_indices[move] = len(moves)
+            moves.append(repr(move))
+        records.append(RECORD.pack(key.to_bytes(16, "big"), value,
+                                   UNLIMITED if depth is None else depth, move_indices[move]))
+    records.sort()  # Keys come first in the records, big-endian, so this sorts them by key
+    moves_section = "".join(move + "\n" for move in moves).encode()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records), len(moves_section)))
+        f.write(moves_section)
+        f.writelines(records)
+
+def build_book(minimax, root_state, plies, path, depth=None):
+    """
+    Offline book builder: searches every position up to `plies` moves away from
+    root_state with a MiniMax instance, and writes them to a book file.
+
+    Parameters:
+    ------------
+    - minimax (MiniMax): The engine searching the positions. Its hash_fn (or
+    canonicalize_fn) must return integer keys.
+    - root_state: Position the book starts from, usually the empty board.
+    - plies (int): Number of moves from root_state covered by the book.
+    - path (str): Path of the book file.
+    - depth (int): Search depth of each position. Defaults to the engine's max_depth.
+    With a time_limit, iterative deepening may stop earlier, and each position is
+    stored with the depth its search completed instead.
+
+    Returns the number of positions written.
+    """
+    depth = minimax.max_depth if depth is None else depth
+    entries = {}
+    layer = [root_state]
+    # Positions are searched, not looked up in the engine's current book
+    book, minimax.opening_book = minimax.opening_book, None
+    try:
+        for _ in range(plies + 1):
+            next_layer = []
+            for state in layer:
+                if minimax.terminal_fn(state):
+                    continue
+                key, symmetry = minimax._tt_key(state)
+                if key in entries:
+                    continue
+                value, action = minimax.best_action(state, k=depth)
+                searched_depth = depth if minimax.time_limit is None else minimax.completed_depth
+                # Like transposition entries, moves are stored in the canonical orientation
+                entries[key] = (value, searched_depth, minimax._map_action(action, symmetry))
+                next_layer.extend(minimax.take_action_fn(state, move)
+                                  for move in minimax.list_actions_fn(state))
+            layer = next_layer
+    finally:
+        minimax.opening_book = book
+    write_book(path, entries)
+    return len(entries)
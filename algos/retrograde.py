@@ -0,0 +1,74 @@
+from collections import deque
+
+
+def retrograde_solve(initial_state,
+                     player_turn_fn: callable,
+                     list_actions_fn: callable,
+                     take_action_fn: callable,
+                     terminal_fn: callable,
+                     utility_fn: callable,
+                     key_fn: callable):
+    """
+    Solves a small game exactly by retrograde analysis: every position reachable
+    from initial_state is enumerated once, then values are propagated backwards
+    from the terminal positions, each position being solved as soon as all of its
+    children are. Only works for games without cycles.
+    Among the moves of best value, a won position picks the fastest win and a lost
+    one the slowest loss.
+
+    Parameters:
+    ------------
+    - Same game functions as MiniMax.
+    - key_fn (callable): Function that takes in a state and returns a hashable key
+    identifying its position.
+
+    Returns a dict mapping the key of every reachable position to its
+    (value, best action, number of moves until the end of the game with perfect play).
+    The best action of terminal positions is None.
+    """
+    # Enumeration: children and parents of every reachable position
+    children, parents, players = {}, {}, {}
+    terminals = []
+    start = key_fn(initial_state)
+    parents[start] = []
+    queue = deque([(start, initial_state)])
+    while queue:
+        key, state = queue.popleft()
+        players[key] = player_turn_fn(state)
+        if terminal_fn(state):
+            children[key] = []
+            terminals.append((key, utility_fn(state)))
+            continue
+        children[key] = []
+        for action in list_actions_fn(state):
+            child = take_action_fn(state, action)
+            child_key = key_fn(child)
+            children[key].append((action, child_key))
+            if child_key not in parents:
+                parents[child_key] = []
+                queue.append((child_key, child))
+            parents[child_key].append(key)
+
+    # Propagation, from the terminal positions back to the initial one
+    solved = {key: (utility, None, 0) for key, utility in terminals}
+    remaining = {key: len(actions) for key, actions in children.items()}
+    queue = deque(key for key, _ in terminals)
+    while queue:
+        key = queue.popleft()
+        for parent in parents[key]:
+            remaining[parent] -= 1
+            if remaining[parent] == 0:
+                solved[parent] = _best_move(players[parent], children[parent], solved)
+                queue.append(parent)
+    assert len(solved) == len(children), "The game has cycles, it can't be solved backwards."
+    return solved
+
+def _best_move(player, actions, solved):
+    def rank(action_child):
+        value, _, distance = solved[action_child[1]]
+        value *= player  # From the point of view of the player to move
+        # Win fast, lose slowly
+        return value, (-distance if value > 0 else distance)
+    action, child = max(actions, key=rank)
+    value, _, distance = solved[child]
+    return value, action, distance + 1
@@ -1,4 +1,18 @@
 import copy
+import heapq
+import time
+import itertools
+from collections import deque, OrderedDict, namedtuple
+try:
+    from .hashing import make_hashable
+    from .stats import SearchStats
+except ImportError:  # Imported as a top-level module, see algos/__init__.py
+    from hashing import make_hashable
+    from stats import SearchStats
+
+# Progress report yielded by `Search.iter_search` after each node expansion
+SearchStep = namedtuple("SearchStep", ["node", "cost", "frontier_size", "n_expanded"])
+
 
 class Node:
     """
@@ -7,20 +21,33 @@ class Node:
     - a parent (node that generated this node)
     - an action (action applied on parent to get node)
     - a path cost (from initial state to node)
+    - a hashable key of the state, computed once at construction
+    Nodes use __slots__ instead of a per-instance dict, since large searches
+    keep millions of them alive at once.
     """
-    def __init__(self, state, parent=None, action=None, cost=None):
+    __slots__ = ("state", "parent", "action", "cost", "heur_val", "key", "hash")
+
+    def __init__(self, state, parent=None, action=None, cost=None, key_fn: callable = None):
         self.state = state
         self.parent = parent
         self.action = action
         self.cost = cost
-        self.is_root_node = True if parent is None else False
-        self.is_leaf_node = False 
         self.heur_val = None
+        # Optional problem-specific key function (e.g. a packed integer)
+        key = key_fn(state) if key_fn else make_hashable(state)
+        # Share the state itself as key when it is already hashable, instead of a copy
+        self.key = state if key is not state and type(key) is type(state) and key == state else key
+        self.hash = hash(self.key)
 
-    def expand(self, list_actions: callable, take_action: callable) -> set:
+    @property
+    def is_root_node(self):
+        return self.parent is None
+
+    def expand(self, list_actions: callable, take_action: callable, key_fn: callable = None) -> set:
         """
         Expands the node, i.e returns a set of all possible
         nodes that the agent can explore from the current node.
+        The node is a leaf node when the set is empty.
         """
         possible_actions = list_actions(self.state)
         nodes = set({})
@@ -28,44 +55,31 @@ class Node:
             new_state, step_cost = take_action(self.state, action)
             # Ensure valid state before creating node
             if new_state is not None:
-                new_node = Node(new_state, self, action, self.cost + step_cost)
+                new_node = Node(new_state, self, action, self.cost + step_cost, key_fn)
                 nodes.add(new_node)
-        if not nodes:
-            self.is_leaf_node = True
         return nodes
     
     def check_goal_state(self, goal_checker: callable):
         return goal_checker(self.state)
 
-    # ==================================================
-    # UNIVERSAL HASHING
-    # ==================================================
-    @staticmethod
-    def _make_hashable(value):
-        """
-        Helper function: Recursively converts lists/dicts into immutable
-        types (tuples) so they can be hashed.
-        """
-        if isinstance(value, list):
-            return tuple(Node._make_hashable(x) for x in value)
-        elif isinstance(value, tuple):
-            return tuple(Node._make_hashable(x) for x in value)
-        elif isinstance(value, set):
-            return tuple(sorted(Node._make_hashable(x) for x in value))
-        elif isinstance(value, dict):
-            return tuple(sorted((k, Node._make_hashable(v)) for k, v in value.items()))
-        else:
-            return value
+    def path(self):
+        """Returns the list of nodes from the root node to this node."""
+        path, node = [], self
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        return path
 
     def __eq__(self, other):
         """Checks if two nodes represent the same state."""
-        return self.state == other.state
+        return self.key == other.key
 
     def __hash__(self):
         """
-        Hashes the state regardless of the state.
+        Hashes the state regardless of the state, using the cached key.
         """
-        return hash(self._make_hashable(self.state))
+        return self.hash
     
     def __repr__(self):
         return str(self.state)
@@ -75,37 +89,44 @@ class Frontier:
     """
     A data structure that contains current exploration options,
     as well as a history of all explored nodes.
+    Nodes are kept in a deque next to a hashed index, so FIFO / LIFO sampling,
+    removal and membership checks all run in amortized O(1).
     """
     def __init__(self, nodes):
         assert all([isinstance(node, Node) for node in nodes]), \
         "Please provide an iterable of nodes."
-        self.nodes = list(nodes)  # Using a list to maintain order
+        self.nodes = deque()  # Using a deque to maintain order
+        self.members = set()  # Set of the nodes currently in the frontier
         self.history = set()  # Set for efficient lookup in history
-            
+        self.extend(nodes)
+
     def remove(self, node):
-        if node in self.nodes:
-            self.nodes.remove(node)
+        if node in self.members:
+            self.members.remove(node)
             self.history.add(node)
-    
+            # Nodes sampled from either end are popped in O(1),
+            # only the heuristic scans below remove from the middle
+            if self.nodes[-1] == node:
+                self.nodes.pop()
+            elif self.nodes[0] == node:
+                self.nodes.popleft()
+            else:
+                self.nodes.remove(node)
+
     def extend(self, nodes):
         # Add only nodes that aren't already in the frontier
         for node in nodes:
-            if node not in self.nodes and node not in self.history:
+            if node not in self.members and node not in self.history:
                 self.nodes.append(node)
-    
+                self.members.add(node)
+
     def fifo(self):
         """First In, First Out - returns the oldest node in the frontier."""
-        try:
-            return self.nodes[0] if self.nodes else None
-        except IndexError:
-            return None
-    
+        return self.nodes[0] if self.nodes else None
+
     def lifo(self):
         """Last In, First Out - returns the newest node in the frontier."""
-        try:
-            return self.nodes[-1] if self.nodes else None
-        except IndexError:
-            return None
+        return self.nodes[-1] if self.nodes else None
         
     def guess(self, heuristic):
         """Samples closest node according to heuristic function."""
@@ -130,8 +151,69 @@ class Frontier:
                 node_minn = node
         return node_minn
 
+    def __contains__(self, node):
+        return node in self.members
+
     def __len__(self):
-        return len(self.nodes)
+        return len(self.members)
+
+
+class PriorityFrontier:
+    """
+    A frontier backed by a binary heap, used by the best-first algorithms.
+    Pushing and sampling cost O(log N) instead of the O(N) scans done by
+    `Frontier.guess` and `Frontier.a_star_guess`. Ties are broken by
+    insertion order and removed nodes are deleted lazily, i.e. their heap
+    entries are only discarded once they reach the top.
+    With `decrease_key` on, a cheaper path to a node already in the frontier
+    replaces it: the old entry goes stale and the node is reinserted.
+    """
+    def __init__(self, nodes, priority: callable, decrease_key=False):
+        assert all([isinstance(node, Node) for node in nodes]), \
+        "Please provide an iterable of nodes."
+        self.priority = priority  # Function that takes in a node and returns its priority
+        self.heap = []  # Entries are [priority, insertion count, node]
+        self.entries = {}  # Maps live nodes to their heap entry
+        self.history = set()
+        self.counter = itertools.count()
+        self.decrease_key = decrease_key
+        self.extend(nodes)
+
+    def push(self, node):
+        entry = [self.priority(node), next(self.counter), node]
+        self.entries[node] = entry
+        heapq.heappush(self.heap, entry)
+
+    def remove(self, node):
+        entry = self.entries.pop(node, None)
+        if entry is not None:
+            entry[-1] = None  # Stale, dropped when it surfaces
+            self.history.add(node)
+
+    def extend(self, nodes):
+        # Add only nodes that aren't already in the frontier,
+        # or that reach a frontier node through a cheaper path
+        for node in nodes:
+            if node in self.history:
+                continue
+            entry = self.entries.get(node)
+            if entry is None:
+                self.push(node)
+            elif self.decrease_key and node.cost < entry[-1].cost:
+                entry[-1] = None
+                self.push(node)
+
+    def best(self):
+        """Returns the node with the lowest priority."""
+        while self.heap and self.heap[0][-1] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][-1] if self.heap else None
+
+    def __contains__(self, node):
+        return node in self.entries
+
+    def __len__(self):
+        return len(self.entries)
 
 
 class Search:
@@ -144,7 +226,19 @@ class Search:
                  take_action: callable,
                  goal_checker: callable,
                  algo = "bfs",
-                 heuristic: callable = None):
+                 heuristic: callable = None,
+                 key_fn: callable = None,
+                 max_depth = None,
+                 cache_size = None,
+                 goal_state = None,
+                 reverse_actions: callable = None,
+                 weight = 1,
+                 time_limit = None,
+                 max_expansions = None,
+                 beam_width = None,
+                 beam_visited_size = None,
+                 batch_heuristic: callable = None,
+                 stats = False):
         """
         A modular implementation of various search algorithms.
 
@@ -162,28 +256,156 @@ class Search:
             * "bfs": Breadth First Search
             * "gbf": Greedy Best First Search
             * "a*": A* Search
+            * "ucs": Uniform Cost Search (Dijkstra), cost-optimal for varying step costs
+            * "ida*": Iterative Deepening A* Search, memory linear in solution depth
+            * "iddfs": Iterative Deepening Depth First Search, memory linear in solution depth
+            * "bidirectional": Bidirectional Uniform Cost Search, from both the start and the
+            goal state (Bidirectional BFS when all step costs are equal)
+            * "anytime a*": Anytime Weighted A* Search, returns a first solution quickly and
+            keeps improving it until the frontier is exhausted or the budget runs out
+            * "beam": Beam Search, keeps only the best nodes of each depth layer (incomplete)
         - heuristic (callable, optional): Function that takes in a state and computes
-        a measure of closeness to the end goal. Needed for "gbf" and "A*" algorithms.
+        a measure of closeness to the end goal. Needed for "gbf", "A*", "IDA*",
+        "anytime A*" and "beam" algorithms.
+        - key_fn (callable, optional): Function that takes in a state and returns a
+        hashable key identifying it (e.g. a packed integer). Defaults to a generic
+        conversion of the state into nested tuples.
+        - max_depth (int, optional): Depth limit for "iddfs" and "beam". Deepening stops
+        at this depth, which makes "iddfs" a depth-limited DFS. Default is None (no limit).
+        - cache_size (int, optional): Number of states remembered by the transposition
+        cache of "ida*" and "iddfs", to skip states already reached more cheaply
+        in the same iteration. Default is None (no cache).
+        - goal_state (optional): The goal state. Needed for "bidirectional" algorithm.
+        - reverse_actions (callable, optional): Function that takes in a state and returns
+        an iterable of (action, previous state, step cost) tuples, one for each state
+        that reaches it through take_action. Used by "bidirectional" algorithm.
+        If not provided, actions are assumed reversible with symmetric costs.
+        - weight (float): Heuristic weight w, nodes are sampled by path cost + w * heuristic
+        in "a*" and "anytime a*" algorithms. With an admissible heuristic, solution costs
+        are at most w times the optimal one. Default is 1 (plain A*).
+        - time_limit (float, optional): Wall-clock budget in seconds for "anytime a*".
+        - max_expansions (int, optional): Node expansion budget for "anytime a*".
+        - beam_width (int, optional): Number of nodes kept per depth layer. Needed for
+        "beam" algorithm.
+        - beam_visited_size (int, optional): Number of states "beam" algorithm remembers as
+        visited, to drop the children it already went through. The most recent ones are
+        kept. Default is None (the states of the last 100 layers, i.e. 100 * beam_width).
+        - batch_heuristic (callable, optional): Function that takes in a list of states and
+        returns the list of their heuristic values. Used instead of heuristic by "beam"
+        algorithm to score a whole layer at once.
+        - stats (bool): Whether to record statistics of each search (nodes expanded per
+        depth, branching factor, cache hits, calls and time of each function given),
+        available as a SearchStats in `self.stats` after the search. Default is False
+        (`self.stats` is None, and nothing is recorded).
         """
-        if algo == "gbf":
-            assert heuristic , "You must provide a heuristic function to guide the frontier sampling"
-            "when using greedy-best search algorithm."
-        self.start = Node(start_state, cost=0)
+        if algo in ("gbf", "a*", "ida*", "anytime a*"):
+            assert heuristic , "You must provide a heuristic function to guide the frontier sampling " \
+            "when using greedy-best or A* search algorithms."
+        if algo == "beam":
+            assert beam_width and (heuristic or batch_heuristic), "You must provide a beam width " \
+            "and a heuristic function when using beam search algorithm."
+        if algo == "bidirectional":
+            assert goal_state is not None, "You must provide the goal state when using " \
+            "bidirectional search algorithm."
+        self.key_fn = key_fn
         self.list_actions = list_actions
         self.take_action = take_action
         self.goal_checker = goal_checker
-        self.frontier = Frontier({self.start})
         self.algo = algo
         self.heuristic = heuristic
+        self.max_depth = max_depth
+        self.cache_size = cache_size
+        self.goal_state = goal_state
+        self.reverse_actions = reverse_actions
+        self.weight = weight
+        self.time_limit = time_limit
+        self.max_expansions = max_expansions
+        self.beam_width = beam_width
+        if algo == "beam" and beam_visited_size is None:
+            beam_visited_size = 100 * beam_width
+        self.beam_visited_size = beam_visited_size
+        self.batch_heuristic = batch_heuristic
+        # Ratio between the cost of the returned solution and the optimal cost is at most this
+        self.suboptimality_bound = None
+        self.n_expanded = 0
+        self.result = None
+        self.stats = SearchStats() if stats else None
+        if self.stats is not None:
+            for name in ("list_actions", "take_action", "goal_checker", "heuristic",
+                         "batch_heuristic", "reverse_actions"):
+                setattr(self, name, self.stats.timed(name, getattr(self, name)))
+            self.key_fn = self.stats.timed("key_fn", self.key_fn)
+        self.start = Node(start_state, cost=0, key_fn=self.key_fn)
+        priorities = {
+                "gbf": lambda node: self.heuristic(node.state),
+                "a*": lambda node: node.cost + self.weight * self.heuristic(node.state),
+                "ucs": lambda node: node.cost,
+        }
+        if algo in priorities:
+            self.frontier = PriorityFrontier({self.start}, priorities[algo],
+                                             decrease_key=algo in ("a*", "ucs"))
+        else:
+            self.frontier = Frontier({self.start})
         self.sample_mapping = {
-                "dfs": self.frontier.lifo,
-                "bfs": self.frontier.fifo,
-                "gbf": lambda: self.frontier.guess(self.heuristic),
-                "a*": lambda: self.frontier.a_star_guess(self.heuristic),
+                "dfs": lambda: self.frontier.lifo(),
+                "bfs": lambda: self.frontier.fifo(),
+                "gbf": lambda: self.frontier.best(),
+                "a*": lambda: self.frontier.best(),
+                "ucs": lambda: self.frontier.best(),
         }
 
 
     def search(self):
+        for _ in self.iter_search():
+            pass
+        return self.result
+
+    def iter_search(self):
+        """
+        Generator version of `search`, running the search one node expansion at a time.
+        Yields a SearchStep (expanded node, its path cost, frontier size, number of
+        nodes expanded so far) after each expansion, so the caller can stop the search
+        early, monitor it, or pause it and resume it later (e.g. across event-loop ticks).
+        Once exhausted, `self.result` holds the value `search` returns.
+        """
+        runners = {
+                "ida*": self._iterative_deepening,
+                "iddfs": self._iterative_deepening,
+                "bidirectional": self._bidirectional,
+                "anytime a*": self._anytime_a_star,
+                "beam": self._beam,
+        }
+        self.result, self.n_expanded = None, 0
+        if self.stats is not None:
+            self.stats.reset()
+            # Maps the keys of expanded nodes to their depth, for the algorithms that don't
+            # track it themselves (they keep every node they reach anyway)
+            self.depths = {}
+            start = time.perf_counter()
+        goal_node = yield from runners.get(self.algo, self._frontier_search)()
+        if goal_node:
+            self.result = iter(goal_node.path()), goal_node.cost
+        if self.stats is not None:
+            self.stats.elapsed = time.perf_counter() - start
+        return self.result
+
+    def _step(self, node, frontier_size, children=(), depth=None):
+        self.n_expanded += 1
+        if self.stats is not None:
+            if depth is None:
+                # Parents are always expanded before their children
+                depth = 0 if node.parent is None else self.depths.get(node.parent.key, 0) + 1
+                self.depths[node.key] = depth
+            self.stats.nodes[depth] += 1
+            self.stats.expand(depth, len(children))
+        return SearchStep(node, node.cost, frontier_size, self.n_expanded)
+
+    def _frontier_search(self):
+        """
+        Samples nodes from the frontier as dictated by the algorithm, until a goal
+        node is expanded or the frontier is exhausted.
+        Returns the goal node, if any.
+        """
         current_node = self.start
         while self.frontier and not current_node.check_goal_state(self.goal_checker):
             current_node = self.sample_mapping.get(self.algo, lambda: None)()
@@ -195,15 +417,272 @@ class Search:
                 self.frontier.remove(current_node)
                 continue
             
-            new_nodes = current_node.expand(self.list_actions, self.take_action)
+            new_nodes = current_node.expand(self.list_actions, self.take_action, self.key_fn)
             self.frontier.remove(current_node)
             self.frontier.extend(new_nodes)
+            yield self._step(current_node, len(self.frontier), new_nodes)
 
         if current_node and current_node.check_goal_state(self.goal_checker):
-            path = [current_node]
-            total_cost = current_node.cost
-            while current_node.parent:
-                current_node = current_node.parent
-                path.append(current_node)
-            return reversed(path), total_cost
-        return None
\ No newline at end of file
+            if self.algo == "a*":
+                self.suboptimality_bound = self.weight
+            return current_node
+        return None
+
+    def _iterative_deepening(self):
+        """
+        Runs bounded depth first searches with an increasing bound on
+        f = path cost + heuristic ("ida*") or on depth ("iddfs"),
+        until a goal node is found or the state space is exhausted.
+        """
+        if self.algo == "ida*":
+            f = lambda node, depth: node.cost + self.heuristic(node.state)
+        else:
+            f = lambda node, depth: depth
+        if self.start.check_goal_state(self.goal_checker):
+            return self.start
+        bound = f(self.start, 0)
+        while bound is not None:
+            if self.algo == "iddfs" and self.max_depth is not None and bound > self.max_depth:
+                break
+            start = time.perf_counter()
+            iteration_bound = bound
+            goal_node, bound = yield from self._bounded_dfs(f, bound)
+            if self.stats is not None:
+                self.stats.iterations[iteration_bound] = time.perf_counter() - start
+            if goal_node:
+                return goal_node
+        return None
+
+    def _bounded_dfs(self, f, bound):
+        """
+        Depth first search that skips nodes whose f value exceeds the bound.
+        Only the current path and its unexplored siblings are kept in memory.
+        Returns the goal node found (if any) and the smallest f value that
+        exceeded the bound, i.e. the bound of the next iteration.
+        """
+        next_bound = None
+        cache = OrderedDict()  # LRU map from state keys to their lowest f value
+        on_path = {self.start}
+        children = self.start.expand(self.list_actions, self.take_action, self.key_fn)
+        stack = [(self.start, 0, iter(children))]
+        yield self._step(self.start, len(stack), children, 0)
+        while stack:
+            node, depth, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(node)
+                continue
+            if child in on_path:  # Avoid cycles
+                continue
+            f_val = f(child, depth + 1)
+            if f_val > bound:
+                if next_bound is None or f_val < next_bound:
+                    next_bound = f_val
+                continue
+            if self.cache_size:
+                seen = cache.get(child.key)
+                if self.stats is not None:
+                    self.stats.cache_lookup(seen is not None and seen <= f_val)
+                if seen is not None and seen <= f_val:
+                    continue
+                cache[child.key] = f_val
+                cache.move_to_end(child.key)
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+            if child.check_goal_state(self.goal_checker):
+                return child, None
+            on_path.add(child)
+            grandchildren = child.expand(self.list_actions, self.take_action, self.key_fn)
+            stack.append((child, depth + 1, iter(grandchildren)))
+            yield self._step(child, len(stack), grandchildren, depth + 1)
+        return None, next_bound
+
+    def _bidirectional(self):
+        """
+        Grows one uniform cost frontier from the start state and one from the goal
+        state, always expanding the smaller one. Frontiers meet when a state generated
+        by one side was already reached by the other. The search stops once the cheapest
+        nodes of both frontiers can no longer lead to a cheaper meeting.
+        Returns the goal node of the spliced path, if any.
+        """
+        goal = Node(self.goal_state, cost=0, key_fn=self.key_fn)
+        if self.start == goal:
+            return self.start
+        cost = lambda node: node.cost
+        frontiers = (PriorityFrontier({self.start}, cost, decrease_key=True),
+                     PriorityFrontier({goal}, cost, decrease_key=True))
+        reached = ({self.start: self.start}, {goal: goal})  # Cheapest node found for each state
+        best_cost, meeting = float("inf"), None
+        while True:
+            tops = (frontiers[0].best(), frontiers[1].best())
+            if tops[0] is None or tops[1] is None or tops[0].cost + tops[1].cost >= best_cost:
+                break
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            node = tops[side]
+            frontiers[side].remove(node)
+            if side == 0:
+                children = node.expand(self.list_actions, self.take_action, self.key_fn)
+            else:
+                children = self._expand_backward(node)
+            for child in children:
+                if child in frontiers[side].history:
+                    continue
+                known = reached[side].get(child)
+                if known is None or child.cost < known.cost:
+                    reached[side][child] = child
+                other = reached[1 - side].get(child)
+                if other is not None and child.cost + other.cost < best_cost:
+                    best_cost = child.cost + other.cost
+                    meeting = (child, other) if side == 0 else (other, child)
+            frontiers[side].extend(children)
+            yield self._step(node, len(frontiers[0]) + len(frontiers[1]), children)
+        return self._splice(*meeting) if meeting else None
+
+    def _expand_backward(self, node):
+        """
+        Expands a node of the backward frontier, i.e. returns the nodes of the states
+        that lead to it. Their action is the one taking them towards the goal.
+        """
+        if self.reverse_actions:
+            predecessors = self.reverse_actions(node.state)
+        else:
+            # Reversible actions: the action is applied backwards, and fixed when splicing
+            predecessors = ((action, *self.take_action(node.state, action))
+                            for action in self.list_actions(node.state))
+        nodes = set({})
+        for action, prev_state, step_cost in predecessors:
+            if prev_state is not None:
+                nodes.add(Node(prev_state, node, action, node.cost + step_cost, self.key_fn))
+        return nodes
+
+    def _splice(self, forward_node, backward_node):
+        """
+        Chains the backward half of the path onto the forward node where both
+        frontiers met, returning the goal node of the resulting forward path.
+        """
+        node = forward_node
+        while backward_node.parent is not None:
+            next_state = backward_node.parent.state
+            action = backward_node.action
+            step_cost = backward_node.cost - backward_node.parent.cost
+            if not self.reverse_actions:
+                # Find the forward action that undoes the backwards one
+                for action in self.list_actions(node.state):
+                    new_state, step_cost = self.take_action(node.state, action)
+                    if new_state is not None and Node(new_state, key_fn=self.key_fn) == backward_node.parent:
+                        break
+                else:
+                    raise ValueError(f"No action leads from {node.state} to {next_state}, actions "
+                                     "aren't reversible: please provide reverse_actions.")
+            node = Node(next_state, node, action, node.cost + step_cost, self.key_fn)
+            backward_node = backward_node.parent
+        return node
+
+    def _anytime_a_star(self):
+        """
+        Anytime Weighted A*: keeps expanding nodes by path cost + w * heuristic after
+        the first solution is found, pruning nodes that can't beat the best solution
+        so far, and reopening nodes reached through cheaper paths. Stops when the
+        frontier is exhausted (the solution is then optimal) or the budget runs out.
+        Once a solution is found, `self.suboptimality_bound` is kept up to date after
+        each expansion, so callers of `iter_search` can stop as soon as it is tight enough.
+        Returns the goal node of the best solution found, if any.
+        """
+        def h(node):
+            # Computed once per node, all the pruning checks reuse it
+            if node.heur_val is None:
+                node.heur_val = self.heuristic(node.state)
+            return node.heur_val
+
+        self.suboptimality_bound = None
+        if self.start.check_goal_state(self.goal_checker):
+            self.suboptimality_bound = 1
+            return self.start
+        start_time = time.perf_counter()
+        frontier = PriorityFrontier({self.start}, lambda node: node.cost + self.weight * h(node),
+                                    decrease_key=True)
+        best_costs = {self.start.key: 0}  # Cheapest path cost found for each state
+        incumbent, n_expansions = None, 0
+        while frontier:
+            if self.time_limit is not None and time.perf_counter() - start_time >= self.time_limit:
+                break
+            if self.max_expansions is not None and n_expansions >= self.max_expansions:
+                break
+            node = frontier.best()
+            frontier.remove(node)
+            if incumbent and node.cost + h(node) >= incumbent.cost:
+                continue
+            n_expansions += 1
+            children = node.expand(self.list_actions, self.take_action, self.key_fn)
+            for child in children:
+                if incumbent and child.cost + h(child) >= incumbent.cost:
+                    continue
+                known = best_costs.get(child.key)
+                if known is not None and known <= child.cost:
+                    continue
+                best_costs[child.key] = child.cost
+                if child.check_goal_state(self.goal_checker):
+                    incumbent = child
+                    continue
+                frontier.history.discard(child)  # Reopen nodes reached through a cheaper path
+                frontier.extend([child])
+            if incumbent:
+                # Every frontier node has path cost + heuristic >= its priority / max(w, 1),
+                # so the top of the heap gives a lower bound on the optimal cost in O(1)
+                top = frontier.best()
+                lower_bound = incumbent.cost if top is None else \
+                    min(incumbent.cost, frontier.heap[0][0] / max(self.weight, 1))
+                self.suboptimality_bound = self._suboptimality_bound(incumbent.cost, lower_bound)
+            yield self._step(node, len(frontier), children)
+        if incumbent is None:
+            return None
+        # The optimal cost is at least the lowest path cost + heuristic left in the frontier
+        lower_bound = min([incumbent.cost] + [node.cost + h(node) for node in frontier.entries])
+        self.suboptimality_bound = self._suboptimality_bound(incumbent.cost, lower_bound)
+        return incumbent
+
+    @staticmethod
+    def _suboptimality_bound(cost, lower_bound):
+        if lower_bound > 0:
+            return cost / lower_bound
+        return 1 if cost == 0 else float("inf")
+
+    def _beam(self):
+        """
+        Breadth first search that only keeps the `beam_width` nodes with the lowest
+        heuristic values of each depth layer. Children whose state was already kept in
+        a layer are dropped, and the search stops once a layer brings no new state, so
+        it can't go around a cycle forever. Memory stays bounded by the beam width and
+        `beam_visited_size` visited states, whatever the size of the state space. Cycles
+        longer than that can then be repeated until `max_depth`.
+        Returns the first goal node found, if any.
+        """
+        if self.start.check_goal_state(self.goal_checker):
+            return self.start
+        layer, depth = [self.start], 0
+        visited = OrderedDict({self.start.key: None})  # Keys of the states kept in a layer
+        while layer and (self.max_depth is None or depth < self.max_depth):
+            children = set()
+            for node in layer:
+                node_children = node.expand(self.list_actions, self.take_action, self.key_fn)
+                children.update(node_children)
+                yield self._step(node, len(layer), node_children, depth)
+            children = [child for child in children if child.key not in visited]
+            for child in children:
+                if child.check_goal_state(self.goal_checker):
+                    return child
+            states = [child.state for child in children]
+            if self.batch_heuristic:
+                scores = self.batch_heuristic(states)
+            else:
+                scores = [self.heuristic(state) for state in states]
+            for child, score in zip(children, scores):
+                child.heur_val = score
+            layer = heapq.nsmallest(self.beam_width, children, key=lambda node: node.heur_val)
+            for node in layer:
+                visited[node.key] = None
+                if len(visited) > self.beam_visited_size:
+                    visited.popitem(last=False)
+            depth += 1
+        return None
@@ -0,0 +1,139 @@
+import time
+from collections import Counter, defaultdict
+
+
+class SearchStats:
+    """
+    Opt-in statistics of the work done by one search call (`Search.search` / `iter_search`,
+    `MiniMax.best_action`), reset at the start of every call. Depths are counted from
+    the root of the search (the start state, or the position MiniMax searches from).
+
+    Attributes:
+    ------------
+    - nodes (Counter): Number of nodes visited at each depth.
+    - expanded (Counter): Number of nodes whose children were generated / searched, per depth.
+    - children (int): Total number of children generated / searched.
+    - cutoffs (Counter): Number of alpha-beta cutoffs at each depth.
+    - cutoff_indices (Counter): Number of cutoffs caused by the 1st, 2nd, ... move searched
+    (index 0 is the first move).
+    - moves_searched (Counter), source_cutoffs (Counter): Number of moves searched and of
+    cutoffs caused, by the source that ordered the move (MiniMax only: "first", "tt",
+    "killer", "history", "order" or "default").
+    - cache_probes (int), cache_hits (int): Lookups in the search's cache (transposition
+    table, IDA* / IDDFS cache), and the ones that settled a node.
+    - calls (Counter), time (dict): Number of calls and seconds spent in each user callable.
+    - iterations (dict): Seconds spent on each iteration of iterative deepening, by depth
+    (or f bound for IDA*).
+    - elapsed (float): Wall-clock seconds of the whole call.
+    """
+    def __init__(self):
+        self.nodes = Counter()
+        self.expanded = Counter()
+        self.children = 0
+        self.cutoffs = Counter()
+        self.cutoff_indices = Counter()
+        self.moves_searched = Counter()
+        self.source_cutoffs = Counter()
+        self.cache_probes = 0
+        self.cache_hits = 0
+        self.calls = Counter()
+        self.time = defaultdict(float)
+        self.iterations = {}
+        self.elapsed = 0.0
+        self.originals = {}  # Maps the names of the timed callables to the callables themselves
+
+    def reset(self):
+        # Counters are cleared in place, since the timed callables hold on to them
+        self.nodes.clear()
+        self.expanded.clear()
+        self.children = 0
+        self.cutoffs.clear()
+        self.cutoff_indices.clear()
+        self.moves_searched.clear()
+        self.source_cutoffs.clear()
+        self.cache_probes = 0
+        self.cache_hits = 0
+        self.calls.clear()
+        self.time.clear()
+        self.iterations = {}
+        self.elapsed = 0.0
+
+    def timed(self, name, fn):
+        """Returns fn wrapped so its calls and time are recorded under name (None stays None)."""
+        if fn is None:
+            return None
+        self.originals[name] = fn
+        calls, times, perf_counter = self.calls, self.time, time.perf_counter
+
+        def timed_fn(*args):
+            start = perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                times[name] += perf_counter() - start
+                calls[name] += 1
+        return timed_fn
+
+    def expand(self, depth, n_children):
+        self.expanded[depth] += 1
+        self.children += n_children
+
+    def cutoff(self, depth, index, source=None):
+        self.cutoffs[depth] += 1
+        self.cutoff_indices[index] += 1
+        if source is not None:
+            self.source_cutoffs[source] += 1
+
+    def cache_lookup(self, hit):
+        self.cache_probes += 1
+        self.cache_hits += hit
+
+    @property
+    def n_nodes(self):
+        return sum(self.nodes.values())
+
+    @property
+    def branching_factor(self):
+        """Average number of children generated / searched per expanded node."""
+        n_expanded = sum(self.expanded.values())
+        return self.children / n_expanded if n_expanded else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        """Share of the cutoffs caused by the first move searched, a measure of move ordering."""
+        n_cutoffs = sum(self.cutoffs.values())
+        return self.cutoff_indices[0] / n_cutoffs if n_cutoffs else 0.0
+
+    def cutoff_rates(self):
+        """Returns the share of searched moves that caused a cutoff, for each move source."""
+        return {source: self.source_cutoffs[source] / searched
+                for source, searched in self.moves_searched.items()}
+
+    @property
+    def cache_hit_rate(self):
+        return self.cache_hits / self.cache_probes if self.cache_probes else 0.0
+
+    def as_dict(self):
+        """Returns the statistics as plain Python types, e.g. for logging as JSON."""
+        return {
+            "elapsed": self.elapsed,
+            "nodes": dict(sorted(self.nodes.items())),
+            "expanded": dict(sorted(self.expanded.items())),
+            "branching_factor": self.branching_factor,
+            "cutoffs": dict(sorted(self.cutoffs.items())),
+            "cutoff_indices": dict(sorted(self.cutoff_indices.items())),
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "moves_searched": dict(self.moves_searched),
+            "source_cutoffs": dict(self.source_cutoffs),
+            "cache_probes": self.cache_probes,
+            "cache_hits": self.cache_hits,
+            "calls": dict(self.calls),
+            "time": dict(self.time),
+            "iterations": dict(self.iterations),
+        }
+
+    def __repr__(self):
+        return (f"SearchStats(elapsed={self.elapsed:.3f}s, nodes={self.n_nodes}, "
+                f"branching_factor={self.branching_factor:.2f}, cutoffs={sum(self.cutoffs.values())}, "
+                f"first_move_cutoff_rate={self.first_move_cutoff_rate:.1%}, "
+                f"cache_hit_rate={self.cache_hit_rate:.1%}, calls={dict(self.calls)})")
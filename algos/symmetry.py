@@ -0,0 +1,27 @@
+def square_symmetries(size):
+    """
+    Returns the 8 symmetries of a size x size grid (the identity, 3 rotations
+    and 4 reflections), each one as a dict mapping every (row, col) cell to its image.
+    """
+    last = size - 1
+    transforms = [
+        lambda row, col: (row, col),
+        lambda row, col: (col, last - row),  # Quarter turn clockwise
+        lambda row, col: (last - row, last - col),  # Half turn
+        lambda row, col: (last - col, row),  # Quarter turn counterclockwise
+        lambda row, col: (row, last - col),  # Mirror left-right
+        lambda row, col: (last - row, col),  # Mirror top-bottom
+        lambda row, col: (col, row),  # Main diagonal
+        lambda row, col: (last - col, last - row),  # Anti-diagonal
+    ]
+    return [{(row, col): transform(row, col) for row in range(size) for col in range(size)}
+            for transform in transforms]
+
+def mirror_symmetries(rows, cols):
+    """Returns the identity and the left-right mirror of a rows x cols grid, as cell dicts."""
+    return [{(row, col): (row, col) for row in range(rows) for col in range(cols)},
+            {(row, col): (row, cols - 1 - col) for row in range(rows) for col in range(cols)}]
+
+def inverse_symmetries(symmetries):
+    """Returns the inverse of each symmetry, mapping images back to their cells."""
+    return [{image: cell for cell, image in symmetry.items()} for symmetry in symmetries]
@@ -0,0 +1,73 @@
+import numpy as np
+
+# Cell values of the int8 board arrays
+EMPTY, X, O = 0, 1, -1
+
+
+def line_windows(rows, cols, length):
+    """Returns all horizontal, vertical and diagonal lines of `length` cells, as lists of (row, col)."""
+    windows = []
+    for d_row, d_col in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+        for row in range(rows):
+            for col in range(cols):
+                end_row, end_col = row + (length - 1) * d_row, col + (length - 1) * d_col
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append([(row + k * d_row, col + k * d_col) for k in range(length)])
+    return windows
+
+def square_windows(rows, cols, size):
+    """Returns all size x size squares of cells, as lists of (row, col)."""
+    return [[(row + i, col + j) for i in range(size) for j in range(size)]
+            for row in range(rows - size + 1) for col in range(cols - size + 1)]
+
+
+class WindowEvaluator:
+    """
+    Vectorized heuristic for grid games scored window by window, e.g. the lines
+    of Connect Four or the 2x2 squares of make-square. Boards are flat int8 arrays
+    (X = 1, O = -1, empty = 0), window cells are gathered through a precomputed
+    index table, and the score of every window comes from a lookup table indexed
+    by its number of X and O pieces. A whole batch of boards is scored in a few
+    array operations.
+    """
+    def __init__(self, rows, cols, windows, window_score: callable):
+        """
+        Parameters:
+        ------------
+        - rows (int), cols (int): Dimensions of the grid.
+        - windows (list): Windows to score, as lists of (row, col) cells, all of the same length.
+        - window_score (callable): Function that takes in the number of X and of O pieces
+        in a window and returns its score.
+        """
+        self.rows, self.cols = rows, cols
+        self.windows = np.array([[row * cols + col for row, col in window] for window in windows],
+                                dtype=np.intp)
+        length = self.windows.shape[1]
+        self.scores = np.array([[window_score(x, o) if x + o <= length else 0
+                                 for o in range(length + 1)] for x in range(length + 1)])
+
+    def encode(self, grid):
+        """Converts a list-of-rows grid of "X" / "O" / None cells into a flat int8 board."""
+        return np.array([X if cell == "X" else O if cell == "O" else EMPTY
+                         for row in grid for cell in row], dtype=np.int8)
+
+    def evaluate_batch(self, boards):
+        """Scores an array of boards of shape (n_boards, rows * cols)."""
+        cells = np.asarray(boards, dtype=np.int8)[:, self.windows]
+        x_counts = np.count_nonzero(cells == X, axis=2)
+        o_counts = np.count_nonzero(cells == O, axis=2)
+        return self.scores[x_counts, o_counts].sum(axis=1)
+
+    def evaluate(self, grid):
+        """Scores a single list-of-rows grid."""
+        return self.evaluate_batch(self.encode(grid)[None]).item()
+
+    def evaluate_children(self, grid, cells, piece):
+        """
+        Scores the boards obtained by putting piece ("X" or "O") on each one of
+        the given (row, col) cells of grid, returning a list of scores.
+        """
+        boards = np.repeat(self.encode(grid)[None], len(cells), axis=0)
+        indices = [row * self.cols + col for row, col in cells]
+        boards[np.arange(len(cells)), indices] = X if piece == "X" else O
+        return self.evaluate_batch(boards).tolist()
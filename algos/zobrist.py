@@ -0,0 +1,88 @@
+import random
+
+
+class ZobristBoard(list):
+    """
+    A grid state (list of rows) that carries the 64-bit Zobrist key of its
+    position, and the keys of its symmetric images if the Zobrist hashing has
+    symmetries. It behaves like a regular list of lists, and `deepcopy` copies
+    the keys along with the cells.
+    """
+    __slots__ = ("key", "keys")
+
+
+class Zobrist:
+    """
+    Zobrist hashing for rows x cols grid games: every (piece, cell) pair gets a
+    random 64-bit number, and a position's key is the XOR of the numbers of its
+    occupied cells. Placing or removing a piece updates the key in O(1), so
+    transposition lookups don't have to walk the whole board.
+    """
+    def __init__(self, rows, cols, pieces=("X", "O"), seed=0, symmetries=()):
+        """
+        Parameters:
+        ------------
+        - rows (int), cols (int): Dimensions of the grid.
+        - pieces (iterable): All the values a non-empty cell can hold. Empty cells are None.
+        - seed (int): Seed of the random numbers, so keys are the same across runs.
+        - symmetries (list): Optional symmetries of the grid, as dicts mapping each
+        (row, col) cell to its image (see algos/symmetry.py), the identity included.
+        Boards then also carry the key of their image under each symmetry, for
+        zobrist_canonical_key.
+        """
+        rng = random.Random(seed)
+        self.table = {piece: [[rng.getrandbits(64) for _ in range(cols)] for _ in range(rows)]
+                      for piece in pieces}
+        # The image of a piece on a cell is the same piece on the image of the cell
+        self.symmetric_tables = [
+            {piece: [[self.table[piece][symmetry[(i, j)][0]][symmetry[(i, j)][1]]
+                      for j in range(cols)] for i in range(rows)] for piece in pieces}
+            for symmetry in symmetries]
+
+    def hash(self, grid, table=None):
+        """Computes the key of a grid from scratch."""
+        table = table or self.table
+        key = 0
+        for i, row in enumerate(grid):
+            for j, cell in enumerate(row):
+                if cell is not None:
+                    key ^= table[cell][i][j]
+        return key
+
+    def board(self, grid):
+        """Returns a ZobristBoard copy of a grid, carrying its keys."""
+        board = ZobristBoard([list(row) for row in grid])
+        board.key = self.hash(board)
+        board.keys = [self.hash(board, table) for table in self.symmetric_tables]
+        return board
+
+    def place(self, board, row, col, piece):
+        """Puts a piece on an empty cell of the board, updating its keys."""
+        board[row][col] = piece
+        board.key ^= self.table[piece][row][col]
+        if self.symmetric_tables:
+            board.keys = [key ^ table[piece][row][col]
+                          for key, table in zip(board.keys, self.symmetric_tables)]
+
+    def remove(self, board, row, col):
+        """Empties a cell of the board, updating its keys."""
+        piece = board[row][col]
+        board.key ^= self.table[piece][row][col]
+        if self.symmetric_tables:
+            board.keys = [key ^ table[piece][row][col]
+                          for key, table in zip(board.keys, self.symmetric_tables)]
+        board[row][col] = None
+
+
+def zobrist_key(board):
+    """Hash function for `MiniMax`, returning the key carried by a ZobristBoard."""
+    return board.key
+
+def zobrist_canonical_key(board):
+    """
+    canonicalize_fn for `MiniMax`, for boards of a Zobrist hashing with symmetries:
+    returns the smallest key among the board's symmetric images, and the index
+    of the symmetry leading to it.
+    """
+    key = min(board.keys)
+    return key, board.keys.index(key)
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from algos.adversarial_search import MiniMax
+import games.connect_four as connect_four
+
+DEPTH = 7
+OPENING = [3, 3, 2, 4]  # Moves played before the benchmarked AI decision
+
+
+class OneSidedMiniMax(MiniMax):
+    """The previous implementation, where each child only receives its parent's running best."""
+    def min(self, state, alpha=float("-inf"), beta=float("inf"), k=None, first_action=None):
+        if k == 0:
+            return self.heuristic_fn(state), None
+        if self.terminal_fn(state):
+            return self.utility_fn(state), None
+        minn, action_minn = float("inf"), None
+        for action in self.list_actions_fn(state):
+            optimal_play, _ = self.max(self.take_action_fn(state, action), beta=minn,
+                                       k=(None if k is None else k-1))
+            if optimal_play < minn:
+                minn, action_minn = optimal_play, action
+            if minn <= alpha:
+                break
+        return minn, action_minn
+
+    def max(self, state, alpha=float("-inf"), beta=float("inf"), k=None, first_action=None):
+        if k == 0:
+            return self.heuristic_fn(state), None
+        if self.terminal_fn(state):
+            return self.utility_fn(state), None
+        maxx, action_maxx = float("-inf"), None
+        for action in self.list_actions_fn(state):
+            optimal_play, _ = self.min(self.take_action_fn(state, action), alpha=maxx,
+                                       k=(None if k is None else k-1))
+            if optimal_play > maxx:
+                maxx, action_maxx = optimal_play, action
+            if maxx >= beta:
+                break
+        return maxx, action_maxx
+
+
+def run(engine_class, **kwargs):
+    n_nodes = 0
+
+    def counting_take_action_fn(state, action):
+        nonlocal n_nodes
+        n_nodes += 1
+        return connect_four.take_action_fn(state, action)
+
+    minimax = engine_class(empty_state=connect_four.INITIAL_STATE,
+                           player_turn_fn=connect_four.player_turn_fn,
+                           list_actions_fn=connect_four.list_actions_fn,
+                           take_action_fn=counting_take_action_fn,
+                           terminal_fn=connect_four.terminal_fn,
+                           utility_fn=connect_four.utility_fn,
+                           heuristic_fn=connect_four.heuristic_fn,
+                           stats=True,
+                           **kwargs)
+    state = connect_four.INITIAL_STATE
+    for action in OPENING:
+        state = connect_four.take_action_fn(state, action)
+    # Previous move's value, as the game loop would have it for aspiration windows
+    minimax.prev_value = connect_four.heuristic_fn(state)
+    start = time.perf_counter()
+    value, action = minimax.best_action(state, k=DEPTH)
+    return n_nodes, time.perf_counter() - start, value, action, minimax
+
+
+if __name__ == "__main__":
+    variants = [
+        ("one-sided bounds", OneSidedMiniMax, {}),
+        ("alpha-beta", MiniMax, {}),
+        ("alpha-beta + PVS", MiniMax, {"pvs": True}),
+        ("alpha-beta + PVS + aspiration", MiniMax, {"pvs": True, "aspiration_window": 10}),
+        ("alpha-beta + center-first", MiniMax,
+         {"order_actions_fn": connect_four.order_actions_fn}),
+        ("+ killers + history", MiniMax,
+         {"order_actions_fn": connect_four.order_actions_fn,
+          "killer_moves": True, "history_heuristic": True}),
+        ("+ TT + PVS", MiniMax,
+         {"order_actions_fn": connect_four.order_actions_fn, "killer_moves": True,
+          "history_heuristic": True, "tt_size": 1_000_000, "pvs": True}),
+    ]
+    baseline = None
+    for name, engine_class, kwargs in variants:
+        n_nodes, elapsed, value, action, minimax = run(engine_class, **kwargs)
+        baseline = baseline or n_nodes
+        print(f"{name:>30}: {n_nodes:9,} nodes ({n_nodes / baseline:6.1%}) "
+              f"in {elapsed:7.2f}s -> value {value}, action {action}")
+        rates = minimax.stats.cutoff_rates()
+        if len(rates) > 1:
+            print(" " * 32 + "cutoff rates: " +
+                  ", ".join(f"{source} {rate:.1%}" for source, rate in sorted(rates.items())))
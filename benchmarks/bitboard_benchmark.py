@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from algos.adversarial_search import MiniMax
+import games.connect_four as connect_four
+import games.connect_four_bitboard as connect_four_bitboard
+
+DEPTH = 7
+OPENING = [3, 3, 2, 4]
+
+
+def run(game):
+    n_nodes = 0
+
+    def counting_apply_action_fn(state, action):
+        nonlocal n_nodes
+        n_nodes += 1
+        return game.apply_action_fn(state, action)
+
+    minimax = MiniMax(empty_state=game.INITIAL_STATE,
+                      player_turn_fn=game.player_turn_fn,
+                      list_actions_fn=game.list_actions_fn,
+                      take_action_fn=game.take_action_fn,
+                      apply_action_fn=counting_apply_action_fn,
+                      undo_action_fn=game.undo_action_fn,
+                      terminal_fn=game.terminal_fn,
+                      utility_fn=game.utility_fn,
+                      heuristic_fn=game.heuristic_fn,
+                      # Same center-first move order for both engines
+                      order_actions_fn=connect_four.order_actions_fn)
+    state = game.INITIAL_STATE
+    for action in OPENING:
+        state = game.take_action_fn(state, action)
+    start = time.perf_counter()
+    value, action = minimax.best_action(state, k=DEPTH)
+    elapsed = time.perf_counter() - start
+    return n_nodes, n_nodes / elapsed, value, action
+
+
+if __name__ == "__main__":
+    results = {}
+    for game in (connect_four, connect_four_bitboard):
+        name = game.__name__.split(".")[-1]
+        n_nodes, nps, value, action = run(game)
+        results[name] = nps
+        print(f"{name:>22}: {n_nodes:8,} nodes at depth {DEPTH}, {nps:9,.0f} nodes/s "
+              f"-> value {value}, action {action}")
+    print(f"Speedup: {results['connect_four_bitboard'] / results['connect_four']:.1f}x")
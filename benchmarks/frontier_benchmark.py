@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+from algos.simple_search import Search, Frontier
+
+# Greedy best-first workload, a grid routing problem: walk from the top-left corner to the
+# bottom-right one, through a serpentine of walls that misleads the heuristic and makes the
+# frontier grow wide.
+SIZE = 200
+WALLS = {(row, col)
+         for col in range(20, SIZE, 20)
+         for row in range(SIZE)
+         if row != (SIZE - 1 if (col // 20) % 2 else 0)}
+GOAL = (SIZE - 1, SIZE - 1)
+
+
+def list_actions(state):
+    return [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+def take_action(state, action):
+    new_state = (state[0] + action[0], state[1] + action[1])
+    if not (0 <= new_state[0] < SIZE and 0 <= new_state[1] < SIZE) or new_state in WALLS:
+        return None, 0
+    return new_state, 1
+
+def goal_checker(state):
+    return state == GOAL
+
+def heuristic(state):
+    return abs(GOAL[0] - state[0]) + abs(GOAL[1] - state[1])
+
+
+# A* workload, the 15-puzzle with the weak misplaced tiles heuristic: A* can't focus
+# on a corridor like on a grid, and its frontier grows into the tens of thousands.
+# Both frontiers run the same number of expansions, since the legacy one would take
+# hours to solve the puzzle. Usage: python frontier_benchmark.py [expansions]
+PUZZLE_GOAL = tuple(range(1, 16)) + (0,)
+EXPANSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 25_000
+
+
+def puzzle_actions(state):
+    # Offsets of the tile that slides into the blank
+    row, col = divmod(state.index(0), 4)
+    return [offset for offset, valid in ((-4, row > 0), (4, row < 3), (-1, col > 0), (1, col < 3))
+            if valid]
+
+def puzzle_take_action(state, action):
+    blank = state.index(0)
+    tiles = list(state)
+    tiles[blank], tiles[blank + action] = tiles[blank + action], tiles[blank]
+    return tuple(tiles), 1
+
+def puzzle_goal_checker(state):
+    return state == PUZZLE_GOAL
+
+def misplaced_tiles(state):
+    return sum(1 for i, tile in enumerate(state) if tile and tile != i + 1)
+
+def scrambled_puzzle(n_moves=200, seed=0):
+    rng, state = random.Random(seed), PUZZLE_GOAL
+    for _ in range(n_moves):
+        state, _ = puzzle_take_action(state, rng.choice(puzzle_actions(state)))
+    return state
+
+
+def run(search, legacy=False, max_expansions=None):
+    algo, heuristic = search.algo, search.heuristic
+    if legacy:
+        # Swap in the list-backed frontier and its O(N) scans
+        search.frontier = Frontier({search.start})
+        scans = {"gbf": search.frontier.guess, "a*": search.frontier.a_star_guess}
+        search.sample_mapping[algo] = lambda: scans[algo](heuristic)
+    start = time.perf_counter()
+    for step in search.iter_search():
+        if max_expansions is not None and step.n_expanded >= max_expansions:
+            break
+    return time.perf_counter() - start, step.frontier_size, search.result
+
+
+def compare(name, make_search, max_expansions=None):
+    legacy_time, legacy_size, legacy_result = run(make_search(), legacy=True, max_expansions=max_expansions)
+    heap_time, heap_size, heap_result = run(make_search(), max_expansions=max_expansions)
+    outcome = (f"cost {legacy_result[1]} / {heap_result[1]}" if max_expansions is None
+               else f"{max_expansions:,} expansions")
+    print(f"{name:>14}: scan {legacy_time:8.3f}s | heap {heap_time:8.3f}s | "
+          f"speedup {legacy_time / heap_time:6.1f}x | frontier {legacy_size:,} / {heap_size:,} "
+          f"nodes, {outcome}")
+
+
+if __name__ == "__main__":
+    compare("gbf (grid)", lambda: Search((0, 0), list_actions, take_action, goal_checker,
+                                         algo="gbf", heuristic=heuristic))
+    start = scrambled_puzzle()
+    compare("a* (15-puzzle)", lambda: Search(start, puzzle_actions, puzzle_take_action,
+                                             puzzle_goal_checker, algo="a*",
+                                             heuristic=misplaced_tiles),
+            max_expansions=EXPANSIONS)
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from algos.adversarial_search import MiniMax
+import games.connect_four as connect_four
+import games.make_square as make_square
+
+# (game module, search depth, opening moves)
+GAMES = [
+    (connect_four, 6, [3, 3, 2, 4]),
+    (make_square, 3, [(2, 2), (3, 3), (2, 3), (3, 2)]),
+]
+
+
+def run(game, depth, opening, in_place):
+    n_nodes = 0
+
+    def counting(fn):
+        def wrapper(*args):
+            nonlocal n_nodes
+            n_nodes += 1
+            return fn(*args)
+        return wrapper
+
+    minimax = MiniMax(empty_state=game.INITIAL_STATE,
+                      player_turn_fn=game.player_turn_fn,
+                      list_actions_fn=game.list_actions_fn,
+                      take_action_fn=counting(game.take_action_fn),
+                      terminal_fn=game.terminal_fn,
+                      utility_fn=game.utility_fn,
+                      heuristic_fn=game.heuristic_fn,
+                      order_actions_fn=game.order_actions_fn,
+                      apply_action_fn=counting(game.apply_action_fn) if in_place else None,
+                      undo_action_fn=game.undo_action_fn if in_place else None)
+    state = game.INITIAL_STATE
+    for action in opening:
+        state = game.take_action_fn(state, action)
+    start = time.perf_counter()
+    minimax.best_action(state, k=depth)
+    elapsed = time.perf_counter() - start
+    return n_nodes, n_nodes / elapsed
+
+
+if __name__ == "__main__":
+    for game, depth, opening in GAMES:
+        name = game.__name__.split(".")[-1]
+        n_nodes, copy_nps = run(game, depth, opening, in_place=False)
+        _, in_place_nps = run(game, depth, opening, in_place=True)
+        print(f"{name:>12} (depth {depth}, {n_nodes:,} nodes): "
+              f"deepcopy {copy_nps:8,.0f} nodes/s | make/unmake {in_place_nps:8,.0f} nodes/s | "
+              f"speedup {in_place_nps / copy_nps:4.2f}x")
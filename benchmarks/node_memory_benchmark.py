@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import tracemalloc
+from algos.simple_search import Search, Node
+
+# Implicit binary tree over the integers 1..N: every state is expanded exactly once
+# and the goal is never reached, so all N nodes stay alive in the frontier history.
+# Usage: python node_memory_benchmark.py [N], default 10 million nodes.
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+
+def list_actions(state):
+    return (0, 1)
+
+def take_action(state, action):
+    child = 2 * state + action
+    return (child, 1) if child <= N else (None, 0)
+
+def goal_checker(state):
+    return False
+
+
+if __name__ == "__main__":
+    print(f"Node instance size: {sys.getsizeof(Node(1, cost=0))} bytes "
+          f"({len(Node.__slots__)} slots, no __dict__)")
+    tracemalloc.start()
+    start = time.perf_counter()
+    search = Search(1, list_actions, take_action, goal_checker, algo="bfs")
+    assert search.search() is None
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_nodes = len(search.frontier.history)
+    print(f"Expanded {n_nodes:,} nodes in {elapsed:.1f}s")
+    print(f"Retained: {current / n_nodes:6.1f} bytes/node "
+          f"(peak {peak / n_nodes:6.1f}), including states and frontier bookkeeping")
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from algos.adversarial_search import MiniMax
+import games.connect_four as connect_four
+
+DEPTH = 7
+OPENING = [3, 3, 2, 4]
+WORKERS = [1, 2, 4, 8]
+
+
+def run(n_workers):
+    minimax = MiniMax(empty_state=connect_four.INITIAL_STATE,
+                      player_turn_fn=connect_four.player_turn_fn,
+                      list_actions_fn=connect_four.list_actions_fn,
+                      take_action_fn=connect_four.take_action_fn,
+                      apply_action_fn=connect_four.apply_action_fn,
+                      undo_action_fn=connect_four.undo_action_fn,
+                      terminal_fn=connect_four.terminal_fn,
+                      utility_fn=connect_four.utility_fn,
+                      heuristic_fn=connect_four.heuristic_fn,
+                      order_actions_fn=connect_four.order_actions_fn,
+                      # A single worker is the serial search
+                      n_workers=n_workers if n_workers > 1 else None)
+    state = connect_four.INITIAL_STATE
+    for action in OPENING:
+        state = connect_four.take_action_fn(state, action)
+    start = time.perf_counter()
+    value, action = minimax.best_action(state, k=DEPTH)
+    elapsed = time.perf_counter() - start
+    minimax.close()
+    return elapsed, value, action
+
+
+if __name__ == "__main__":
+    print(f"Connect Four, depth {DEPTH}, {os.cpu_count()} CPUs available")
+    serial = None
+    for n_workers in WORKERS:
+        elapsed, value, action = run(n_workers)
+        serial = serial or (elapsed, action)
+        print(f"{n_workers} worker(s): {elapsed:6.2f}s, speedup {serial[0] / elapsed:4.2f}x "
+              f"-> value {value}, action {action}"
+              f"{'' if action == serial[1] else ' (differs from the serial search!)'}")
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from algos.adversarial_search import MiniMax
+from algos.zobrist import zobrist_key, zobrist_canonical_key
+import games.tictactoe as tictactoe
+import games.connect_four as connect_four
+import games.make_square as make_square
+
+# (game module, search depth, hash_fn, canonicalize_fn), searched from the empty board
+GAMES = [
+    (tictactoe, None, None, tictactoe.canonicalize_fn),
+    (connect_four, 7, zobrist_key, zobrist_canonical_key),
+    (make_square, 3, zobrist_key, zobrist_canonical_key),
+]
+
+
+def run(game, depth, hash_fn, canonicalize_fn):
+    n_nodes = 0
+
+    def counting_apply_action_fn(state, action):
+        nonlocal n_nodes
+        n_nodes += 1
+        return game.apply_action_fn(state, action)
+
+    minimax = MiniMax(empty_state=game.INITIAL_STATE,
+                      player_turn_fn=game.player_turn_fn,
+                      list_actions_fn=game.list_actions_fn,
+                      take_action_fn=game.take_action_fn,
+                      apply_action_fn=counting_apply_action_fn,
+                      undo_action_fn=game.undo_action_fn,
+                      terminal_fn=game.terminal_fn,
+                      utility_fn=game.utility_fn,
+                      heuristic_fn=getattr(game, "heuristic_fn", None),
+                      tt_size=10_000_000,
+                      hash_fn=hash_fn,
+                      canonicalize_fn=canonicalize_fn,
+                      transform_action_fn=game.transform_action_fn if canonicalize_fn else None)
+    start = time.perf_counter()
+    value, action = minimax.best_action(game.INITIAL_STATE, k=depth)
+    elapsed = time.perf_counter() - start
+    # Every position searched gets a table entry, so its size counts the unique nodes
+    return len(minimax.tt), n_nodes, elapsed, value, action
+
+
+if __name__ == "__main__":
+    for game, depth, hash_fn, canonicalize_fn in GAMES:
+        name = game.__name__.split(".")[-1]
+        print(f"{name} (depth {depth or 'full'}):")
+        for label, fn in (("plain", None), ("canonical", canonicalize_fn)):
+            unique, n_nodes, elapsed, value, action = run(game, depth, hash_fn, fn)
+            print(f"  {label:>9}: {unique:8,} unique nodes, {n_nodes:9,} nodes searched "
+                  f"in {elapsed:6.2f}s -> value {value}, action {action}")
@@ -3,18 +3,28 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from algos.adversarial_search import MiniMax
+from algos.zobrist import Zobrist, zobrist_key, zobrist_canonical_key
+from algos.symmetry import mirror_symmetries
+from algos.opening_book import OpeningBook, build_book
 from copy import deepcopy
 from collections import Counter
+try:
+    from algos.window_eval import WindowEvaluator, line_windows
+except ImportError:  # NumPy isn't installed, keep the pure Python heuristic only
+    WindowEvaluator = None
 
 
-INITIAL_STATE = [
+# Mirrored positions are equivalent, boards also carry the key of their mirror image
+ZOBRIST = Zobrist(rows=6, cols=7, symmetries=mirror_symmetries(6, 7))
+
+INITIAL_STATE = ZOBRIST.board([
     [None, None, None, None, None, None, None],
     [None, None, None, None, None, None, None],
     [None, None, None, None, None, None, None],
     [None, None, None, None, None, None, None],
     [None, None, None, None, None, None, None],
     [None, None, None, None, None, None, None],
-]
+])
 
 
 def player_turn_fn(state):
@@ -37,13 +47,29 @@ def list_actions_fn(state):
             actions.add(col)
     return actions
 
+def order_actions_fn(state, actions):
+    # Central columns belong to more windows, try them first
+    return sorted(actions, key=lambda col: abs(col - 3))
+
 def take_action_fn(state, action):
     result = deepcopy(state)
+    apply_action_fn(result, action)
+    return result
+
+def apply_action_fn(state, action):
+    # Drops a piece in place, returning the row it landed on
     for row in range(5, -1, -1):
         if state[row][action] is None:
             break
-    result[row][action] = "X" if player_turn_fn(state) == 1 else "O"
-    return result
+    ZOBRIST.place(state, row, action, "X" if player_turn_fn(state) == 1 else "O")
+    return row
+
+def undo_action_fn(state, action, row):
+    ZOBRIST.remove(state, row, action)
+
+def transform_action_fn(action, symmetry, inverse=False):
+    # Symmetry 1 is the mirror, which is its own inverse
+    return 6 - action if symmetry else action
 
 
 def utility_fn(state):
@@ -121,9 +147,47 @@ def evaluate_window(window):
     return 0  # Neutral
 
 
+def window_score(n_x, n_o):
+    return evaluate_window(["X"] * n_x + ["O"] * n_o + [None] * (4 - n_x - n_o))
+
+# Vectorized version of heuristic_fn, scoring all 69 windows in a few array operations
+EVALUATOR = WindowEvaluator(6, 7, line_windows(6, 7, 4), window_score) if WindowEvaluator else None
+
+def children_heuristic_fn(state, actions):
+    # Heuristic values of the states reached by each action, computed in one batch
+    cells = []
+    for col in actions:
+        for row in range(5, -1, -1):
+            if state[row][col] is None:
+                break
+        cells.append((row, col))
+    return EVALUATOR.evaluate_children(state, cells, "X" if player_turn_fn(state) == 1 else "O")
+
+
 def terminal_fn(state):
     return utility_fn(state) is not None
 
+def outcome_fn(state, last_action):
+    # Same result as utility_fn, but only the lines through the piece just dropped
+    # can hold a new four-in-a-row
+    if last_action is None:
+        return utility_fn(state)
+    col = last_action
+    for row in range(6):
+        if state[row][col] is not None:
+            break
+    piece = state[row][col]
+    for d_row, d_col in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+        count = 1
+        for sign in (1, -1):
+            i, j = row + sign * d_row, col + sign * d_col
+            while 0 <= i < 6 and 0 <= j < 7 and state[i][j] == piece:
+                count += 1
+                i, j = i + sign * d_row, j + sign * d_col
+        if count >= 4:
+            return 1 if piece == "X" else -1
+    return None
+
 def pretty_print_fn(state):
     print("\n")
     print("     0   1   2   3   4   5   6")
@@ -137,14 +201,41 @@ def pretty_print_fn(state):
 
 
 
-minimax = MiniMax(empty_state = INITIAL_STATE,
-                  player_turn_fn = player_turn_fn, 
-                  list_actions_fn = list_actions_fn, 
-                  take_action_fn = take_action_fn,
-                  terminal_fn = terminal_fn,
-                  utility_fn = utility_fn, 
-                  max_depth = 7,
-                  heuristic_fn = heuristic_fn,
-                  play_as = 1, 
-                  pretty_print_fn = pretty_print_fn)
-minimax.game()
+# Built offline with `python games/connect_four.py --build-book [plies]`
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "connect_four_book.bin")
+
+
+if __name__ == "__main__":
+    building_book = sys.argv[1:2] == ["--build-book"]
+    minimax = MiniMax(empty_state = INITIAL_STATE,
+                      player_turn_fn = player_turn_fn, 
+                      list_actions_fn = list_actions_fn, 
+                      take_action_fn = take_action_fn,
+                      apply_action_fn = apply_action_fn,
+                      undo_action_fn = undo_action_fn,
+                      terminal_fn = terminal_fn,
+                      utility_fn = utility_fn, 
+                      max_depth = 7,
+                      heuristic_fn = heuristic_fn,
+                      play_as = 1, 
+                      pretty_print_fn = pretty_print_fn,
+                      tt_size = 1_000_000,
+                      hash_fn = zobrist_key,
+                      canonicalize_fn = zobrist_canonical_key,
+                      transform_action_fn = transform_action_fn,
+                      order_actions_fn = order_actions_fn,
+                      killer_moves = True,
+                      history_heuristic = True,
+                      batch_heuristic_fn = children_heuristic_fn if EVALUATOR else None,
+                      # With a single CPU, one worker behind IPC is slower than searching here
+                      n_workers = os.cpu_count() if (os.cpu_count() or 1) > 1 else None,
+                      outcome_fn = outcome_fn,
+                      opening_book = (OpeningBook(BOOK_PATH) if os.path.exists(BOOK_PATH)
+                                      and not building_book else None))
+    if building_book:
+        plies = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+        n_positions = build_book(minimax, INITIAL_STATE, plies, BOOK_PATH)
+        minimax.close()
+        print(f"Wrote {n_positions} positions up to {plies} plies deep to {BOOK_PATH}.")
+    else:
+        minimax.game()
@@ -0,0 +1,180 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algos.adversarial_search import MiniMax
+
+# Bitboard layout: column c, row r (0 is the bottom row) is bit 7 * c + r.
+# Every column has a 7th, always empty, bit so that shifted lines never wrap
+# from the top of a column to the bottom of the next one.
+ROWS, COLS = 6, 7
+CENTER_FIRST = [3, 2, 4, 1, 5, 0, 6]
+# Shifts between consecutive cells of a line: vertical, horizontal, and both diagonals
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+SHIFTS = [1, 7, 8, 6]
+
+
+def bit(row, col):
+    return 1 << (7 * col + row)
+
+def _line_mask(row, col, d_row, d_col):
+    # All the cells at most 3 steps away from (row, col) along a direction
+    mask = 0
+    for step in range(-3, 4):
+        r, c = row + step * d_row, col + step * d_col
+        if 0 <= r < ROWS and 0 <= c < COLS:
+            mask |= bit(r, c)
+    return mask
+
+# LINES[row][col] holds, for each direction, the cells of the lines through (row, col)
+LINES = [[[_line_mask(row, col, d_row, d_col) for d_row, d_col in DIRECTIONS]
+          for col in range(COLS)] for row in range(ROWS)]
+
+# All the playable cells
+FULL = sum(bit(row, col) for row in range(ROWS) for col in range(COLS))
+
+
+class BitboardState:
+    """
+    A Connect Four position: one 64-bit board per player (X then O), the
+    height of each column, the number of moves played and the winner so far
+    (+1 for X, -1 for O, 0 for none), which is updated on every move.
+    """
+    __slots__ = ("boards", "heights", "moves", "winner")
+
+    def __init__(self, boards=(0, 0), heights=(0,) * COLS, moves=0, winner=0):
+        self.boards = list(boards)
+        self.heights = list(heights)
+        self.moves = moves
+        self.winner = winner
+
+    def copy(self):
+        return BitboardState(self.boards, self.heights, self.moves, self.winner)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+
+INITIAL_STATE = BitboardState()
+
+
+def player_turn_fn(state):
+    # X begins first, he's the MAX player
+    return 1 if state.moves % 2 == 0 else -1
+
+def list_actions_fn(state):
+    # Columns that aren't full, central ones first
+    return [col for col in CENTER_FIRST if state.heights[col] < ROWS]
+
+def take_action_fn(state, action):
+    result = state.copy()
+    apply_action_fn(result, action)
+    return result
+
+def apply_action_fn(state, action):
+    player = state.moves % 2
+    row = state.heights[action]
+    state.boards[player] |= bit(row, action)
+    state.heights[action] += 1
+    state.moves += 1
+    # Only lines through the piece just dropped can hold a new four-in-a-row
+    board = state.boards[player]
+    for line, shift in zip(LINES[row][action], SHIFTS):
+        pairs = board & line
+        pairs &= pairs >> shift
+        if pairs & (pairs >> 2 * shift):
+            state.winner = 1 if player == 0 else -1
+            break
+    return row
+
+def undo_action_fn(state, action, row):
+    state.moves -= 1
+    state.heights[action] -= 1
+    state.boards[state.moves % 2] &= ~bit(row, action)
+    state.winner = 0  # The game was still going on before the move
+
+def utility_fn(state):
+    if state.winner:
+        return state.winner
+    if state.moves == ROWS * COLS:
+        return 0  # Draw
+    return None  # No winner yet
+
+def terminal_fn(state):
+    return state.winner != 0 or state.moves == ROWS * COLS
+
+def outcome_fn(state, last_action):
+    # Wins are already detected by apply_action_fn, so this is utility_fn in one call
+    return utility_fn(state)
+
+def hash_fn(state):
+    return state.boards[0] | state.boards[1] << 64
+
+def heuristic_fn(state):
+    # Same scores as games/connect_four.py
+    x_board, o_board = state.boards
+    return _player_score(x_board, o_board) - _player_score(o_board, x_board)
+
+def _player_score(board, opponent):
+    """
+    Scores the windows of 4 cells free of opponent pieces: 100 for 4 pieces of the player,
+    10 for 3 and 5 for 2. Windows are identified by their first cell, and all the windows
+    of a direction are counted at once by adding up their 4 cells bit by bit.
+    """
+    free = FULL & ~opponent
+    score = 0
+    for shift in SHIFTS:
+        starts = free & (free >> shift) & (free >> 2 * shift) & (free >> 3 * shift)
+        if not starts:
+            continue
+        p0, p1 = board & starts, (board >> shift) & starts
+        p2, p3 = (board >> 2 * shift) & starts, (board >> 3 * shift) & starts
+        # Bit-sliced sum of the 4 cells: ones + 2 * twos + 4 * fours
+        sum_01, carry_01 = p0 ^ p1, p0 & p1
+        sum_23, carry_23 = p2 ^ p3, p2 & p3
+        ones, carry = sum_01 ^ sum_23, sum_01 & sum_23
+        twos = carry_01 ^ carry_23 ^ carry
+        fours = (carry_01 & carry_23) | ((carry_01 ^ carry_23) & carry)
+        score += (100 * fours.bit_count()
+                  + 10 * (ones & twos).bit_count()
+                  + 5 * (twos & ~ones & ~fours).bit_count())
+    return score
+
+def to_grid(state):
+    """Returns the position as the list of rows used by games/connect_four.py."""
+    return [[("X" if state.boards[0] & bit(row, col) else
+              "O" if state.boards[1] & bit(row, col) else None)
+             for col in range(COLS)] for row in range(ROWS - 1, -1, -1)]
+
+def pretty_print_fn(state):
+    print("\n")
+    print("     0   1   2   3   4   5   6")
+    print("   +---+---+---+---+---+---+---+")
+    for i, row in enumerate(to_grid(state)):
+        print(f" {i} |", end=" ")
+        for cell in row:
+            symbol = cell if cell else " "
+            print(f"{symbol} |", end=" ")
+        print("\n   +---+---+---+---+---+---+---+")
+
+
+
+if __name__ == "__main__":
+    minimax = MiniMax(empty_state = INITIAL_STATE,
+                      player_turn_fn = player_turn_fn,
+                      list_actions_fn = list_actions_fn,
+                      take_action_fn = take_action_fn,
+                      apply_action_fn = apply_action_fn,
+                      undo_action_fn = undo_action_fn,
+                      terminal_fn = terminal_fn,
+                      utility_fn = utility_fn,
+                      max_depth = 9,
+                      heuristic_fn = heuristic_fn,
+                      play_as = 1,
+                      pretty_print_fn = pretty_print_fn,
+                      tt_size = 1_000_000,
+                      hash_fn = hash_fn,
+                      killer_moves = True,
+                      history_heuristic = True,
+                      outcome_fn = outcome_fn)
+    minimax.game()
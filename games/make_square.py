@@ -3,11 +3,22 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from algos.adversarial_search import MiniMax
+from algos.zobrist import Zobrist, zobrist_key, zobrist_canonical_key
+from algos.symmetry import square_symmetries, inverse_symmetries
 from copy import deepcopy
+try:
+    from algos.window_eval import WindowEvaluator, square_windows
+except ImportError:  # NumPy isn't installed, keep the pure Python heuristic only
+    WindowEvaluator = None
 
-INITIAL_STATE = [
+# Rotated and reflected positions are equivalent, boards also carry the keys of their images
+SYMMETRIES = square_symmetries(6)
+INVERSES = inverse_symmetries(SYMMETRIES)
+ZOBRIST = Zobrist(rows=6, cols=6, symmetries=SYMMETRIES)
+
+INITIAL_STATE = ZOBRIST.board(
     [None for _ in range(6)] for _ in range(6)
-]
+)
 
 def player_turn_fn(state):
     n_filled = sum(1 for row in state for cell in row if cell is not None)
@@ -20,12 +31,26 @@ def list_actions_fn(state):
                if state[row][col] is None}
     return actions
 
+def order_actions_fn(state, actions):
+    # Central cells belong to more 2x2 squares, try them first
+    return sorted(actions, key=lambda cell: abs(2.5 - cell[0]) + abs(2.5 - cell[1]))
+
 def take_action_fn(state, action):
     result = deepcopy(state)
-    row, col = action
-    result[row][col] = "X" if player_turn_fn(state) == 1 else "O"
+    apply_action_fn(result, action)
     return result
 
+def apply_action_fn(state, action):
+    row, col = action
+    ZOBRIST.place(state, row, col, "X" if player_turn_fn(state) == 1 else "O")
+
+def undo_action_fn(state, action, undo_info=None):
+    row, col = action
+    ZOBRIST.remove(state, row, col)
+
+def transform_action_fn(action, symmetry, inverse=False):
+    return (INVERSES if inverse else SYMMETRIES)[symmetry][action]
+
 def utility_fn(state):
     # A complete 2x2 square wins.
     for i in range(len(state) - 1):
@@ -52,19 +77,44 @@ def heuristic_fn(state):
                 state[i][j], state[i][j+1],
                 state[i+1][j], state[i+1][j+1]
             ]
-            x = square.count("X")
-            o = square.count("O")
-            # Score squares where the player can potentially complete a 2x2
-            if x > 0 and o == 0:
-                # Use exponential scoring to prioritize squares closer to completion
-                score += x * x * x
-            elif o > 0 and x == 0:
-                score -= o * o * o
+            score += square_score(square.count("X"), square.count("O"))
     return score
 
+def square_score(x, o):
+    # Score squares where the player can potentially complete a 2x2
+    if x > 0 and o == 0:
+        # Use exponential scoring to prioritize squares closer to completion
+        return x * x * x
+    elif o > 0 and x == 0:
+        return -o * o * o
+    return 0
+
+# Vectorized version of heuristic_fn, scoring all 25 squares in a few array operations
+EVALUATOR = WindowEvaluator(6, 6, square_windows(6, 6, 2), square_score) if WindowEvaluator else None
+
+def children_heuristic_fn(state, actions):
+    # Heuristic values of the states reached by each action, computed in one batch
+    return EVALUATOR.evaluate_children(state, list(actions), "X" if player_turn_fn(state) == 1 else "O")
+
 def terminal_fn(state):
     return utility_fn(state) is not None
 
+def outcome_fn(state, last_action):
+    # Same result as utility_fn, but only the (up to 4) squares containing the
+    # last cell played can have been completed
+    if last_action is None:
+        return utility_fn(state)
+    row, col = last_action
+    piece = state[row][col]
+    for i in (row - 1, row):
+        for j in (col - 1, col):
+            if 0 <= i < 5 and 0 <= j < 5 and \
+                    state[i][j] == state[i][j+1] == state[i+1][j] == state[i+1][j+1] == piece:
+                return 1 if piece == "X" else -1
+    if all(None not in cells for cells in state):
+        return 0  # Draw
+    return None
+
 def pretty_print_fn(state):
     print("\n     0   1   2   3   4   5")
     print("   +---+---+---+---+---+---+")
@@ -75,15 +125,27 @@ def pretty_print_fn(state):
             print(f"{symbol} |", end=" ")
         print("\n   +---+---+---+---+---+---+")
 
-# Optionally increase max_depth for a 6x6 grid.
-minimax = MiniMax(empty_state=INITIAL_STATE,
-                  player_turn_fn=player_turn_fn, 
-                  list_actions_fn=list_actions_fn, 
-                  take_action_fn=take_action_fn,
-                  terminal_fn=terminal_fn,
-                  utility_fn=utility_fn, 
-                  max_depth=5,  # increased from 4
-                  heuristic_fn=heuristic_fn,
-                  play_as=1, 
-                  pretty_print_fn=pretty_print_fn)
-minimax.game()
+if __name__ == "__main__":
+    # Optionally increase max_depth for a 6x6 grid.
+    minimax = MiniMax(empty_state=INITIAL_STATE,
+                      player_turn_fn=player_turn_fn, 
+                      list_actions_fn=list_actions_fn, 
+                      take_action_fn=take_action_fn,
+                      apply_action_fn=apply_action_fn,
+                      undo_action_fn=undo_action_fn,
+                      terminal_fn=terminal_fn,
+                      utility_fn=utility_fn, 
+                      max_depth=5,  # increased from 4
+                      heuristic_fn=heuristic_fn,
+                      play_as=1, 
+                      pretty_print_fn=pretty_print_fn,
+                      tt_size=1_000_000,
+                      hash_fn=zobrist_key,
+                      canonicalize_fn=zobrist_canonical_key,
+                      transform_action_fn=transform_action_fn,
+                      order_actions_fn=order_actions_fn,
+                      killer_moves=True,
+                      history_heuristic=True,
+                      batch_heuristic_fn=children_heuristic_fn if EVALUATOR else None,
+                      outcome_fn=outcome_fn)
+    minimax.game()
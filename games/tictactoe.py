@@ -3,7 +3,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from algos.adversarial_search import MiniMax
+from algos.symmetry import square_symmetries, inverse_symmetries
+from algos.retrograde import retrograde_solve
 from copy import deepcopy
 import tkinter as tk
 from tkinter import messagebox
@@ -35,9 +36,29 @@ def list_actions_fn(state):
 
 def take_action_fn(state, action):
     result = deepcopy(state)
-    result[action[0]][action[1]] = "X" if player_turn_fn(state) == 1 else "O"
+    apply_action_fn(result, action)
     return result
 
+def apply_action_fn(state, action):
+    state[action[0]][action[1]] = "X" if player_turn_fn(state) == 1 else "O"
+
+def undo_action_fn(state, action, undo_info=None):
+    state[action[0]][action[1]] = None
+
+SYMMETRIES = square_symmetries(3)
+INVERSES = inverse_symmetries(SYMMETRIES)
+# For each symmetry, the cell whose content goes to each cell of the image (row by row)
+SOURCES = [[inverse[(row, col)] for row in range(3) for col in range(3)] for inverse in INVERSES]
+
+def canonicalize_fn(state):
+    # The smallest of the 8 symmetric images of the board, and the symmetry leading to it
+    images = [tuple(state[row][col] or "" for row, col in sources) for sources in SOURCES]
+    key = min(images)
+    return key, images.index(key)
+
+def transform_action_fn(action, symmetry, inverse=False):
+    return (INVERSES if inverse else SYMMETRIES)[symmetry][action]
+
 
 def utility_fn(state):
     for i in range(3):  # Check rows
@@ -62,6 +83,21 @@ def utility_fn(state):
 def terminal_fn(state):
     return utility_fn(state) is not None
 
+def outcome_fn(state, last_action):
+    # Same result as utility_fn, but only the lines through the last cell played are checked
+    if last_action is None:
+        return utility_fn(state)
+    row, col = last_action
+    piece = state[row][col]
+    if state[row][0] == state[row][1] == state[row][2] or \
+            state[0][col] == state[1][col] == state[2][col] or \
+            (row == col and state[0][0] == state[1][1] == state[2][2]) or \
+            (row + col == 2 and state[0][2] == state[1][1] == state[2][0]):
+        return 1 if piece == "X" else -1
+    if all(None not in cells for cells in state):
+        return 0  # Draw
+    return None
+
 def pretty_print_fn(state):
     print("\n")
     print("     0   1   2")
@@ -74,67 +110,52 @@ def pretty_print_fn(state):
         print("\n   +---+---+---+")
 
 
-# Custom MiniMax class with minimax_decision method
-class MiniMaxTicTacToe(MiniMax):
-    def minimax_decision(self, state):
-        """
-        Returns the best action for the current player using minimax algorithm.
-        """
-        actions = self.list_actions_fn(state)
-        
-        if not actions:
-            return None
-            
-        player = self.player_turn_fn(state)
-        
-        if player == 1:  # MAX player
-            best_score = float('-inf')
-            best_action = None
-            
-            for action in actions:
-                next_state = self.take_action_fn(state, action)
-                score = self.min_value(next_state)
-                
-                if score > best_score:
-                    best_score = score
-                    best_action = action
-        else:  # MIN player
-            best_score = float('inf')
-            best_action = None
-            
-            for action in actions:
-                next_state = self.take_action_fn(state, action)
-                score = self.max_value(next_state)
-                
-                if score < best_score:
-                    best_score = score
-                    best_action = action
-                    
-        return best_action
-    
-    def max_value(self, state):
-        if self.terminal_fn(state):
-            return self.utility_fn(state)
-            
-        value = float('-inf')
-        
-        for action in self.list_actions_fn(state):
-            next_state = self.take_action_fn(state, action)
-            value = max(value, self.min_value(next_state))
-            
-        return value
-        
-    def min_value(self, state):
-        if self.terminal_fn(state):
-            return self.utility_fn(state)
-            
-        value = float('inf')
-        
-        for action in self.list_actions_fn(state):
-            next_state = self.take_action_fn(state, action)
-            value = min(value, self.max_value(next_state))
-            
-        return value
+# Perfect-play table: one byte per board index (see board_index), holding
+# (value + 1) * 16 + best move (row * 3 + col, 9 if the game is over),
+# or UNREACHABLE for boards that can't come up in a game.
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_table.bin")
+UNREACHABLE = 0xFF
+NO_MOVE = 9
+
+def board_index(state):
+    # The board read as a base 3 number: empty = 0, X = 1, O = 2
+    index = 0
+    for row in state:
+        for cell in row:
+            index = 3 * index + (1 if cell == "X" else 2 if cell == "O" else 0)
+    return index
+
+def build_table():
+    """Solves every reachable board (5,478 of them) and packs the results in a perfect-play table."""
+    solved = retrograde_solve(INITIAL_STATE, player_turn_fn, list_actions_fn, take_action_fn,
+                              terminal_fn, utility_fn, key_fn=board_index)
+    table = bytearray([UNREACHABLE]) * 3 ** 9
+    for index, (value, action, _) in solved.items():
+        move = NO_MOVE if action is None else 3 * action[0] + action[1]
+        table[index] = (value + 1) * 16 + move
+    return bytes(table)
+
+def load_table(path=TABLE_PATH):
+    """Loads the perfect-play table from path, building and saving it there first if needed."""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            table = f.read()
+        if len(table) == 3 ** 9:
+            return table
+    table = build_table()
+    try:
+        with open(path, "wb") as f:
+            f.write(table)
+    except OSError:
+        pass  # Read-only install, the table is rebuilt on every start
+    return table
+
+def table_lookup(table, state):
+    """Returns the value of a board with perfect play, and the best move (None if the game is over)."""
+    entry = table[board_index(state)]
+    assert entry != UNREACHABLE, "This board can't come up in a game."
+    value, move = entry // 16 - 1, entry % 16
+    return value, (None if move == NO_MOVE else divmod(move, 3))
 
 
 class TicTacToeGUI:
@@ -149,17 +170,8 @@ class TicTacToeGUI:
         self.human_player = 1  # X is human (MAX player)
         self.ai_player = -1    # O is AI (MIN player)
         
-        # Initialize MiniMaxTicTacToe algorithm instead of MiniMax
-        self.minimax = MiniMaxTicTacToe(
-            empty_state=INITIAL_STATE,
-            player_turn_fn=player_turn_fn,
-            list_actions_fn=list_actions_fn,
-            take_action_fn=take_action_fn,
-            terminal_fn=terminal_fn,
-            utility_fn=utility_fn,
-            play_as=self.ai_player,  # AI plays as O
-            pretty_print_fn=pretty_print_fn
-        )
+        # Perfect play is precomputed, AI moves are table lookups
+        self.table = load_table()
         
         # Create game status label
         self.status_font = font.Font(size=14, weight="bold")
@@ -222,7 +234,7 @@ class TicTacToeGUI:
         self.status_label.config(text="AI is thinking...")
         self.root.update()
         
-        action = self.minimax.minimax_decision(self.current_state)
+        _, action = table_lookup(self.table, self.current_state)
         self.current_state = take_action_fn(self.current_state, action)
         self.update_board()
         